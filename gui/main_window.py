@@ -13,6 +13,8 @@
 
 import sys
 import os
+import time
+import logging
 
 # 添加项目根目录到 Python 路径（必须在其他导入之前）
 if __name__ == "__main__":
@@ -50,6 +52,7 @@ except ImportError:
 
 from gui.settings_panel import SettingsPanel
 from src.utils.config_updater import ConfigUpdater
+from src.utils.logger import setup_logger
 
 
 class MainWindow:
@@ -880,8 +883,6 @@ class MainWindow:
 
                     # CLIP检测（如果有detector）
                     if hasattr(self, "detector") and self.detector:
-                        import time
-
                         current_time = time.time()
                         if (
                             current_time - self.last_detect_time
@@ -1229,8 +1230,6 @@ class MainWindow:
         Args:
             result: 检测结果字典，包含 scenario_name, confidence, alert_level 等
         """
-        import time
-
         # 添加时间戳
         alert_record = {
             "time": time.strftime("%H:%M:%S"),
@@ -1355,6 +1354,10 @@ class MainWindow:
 
 def main() -> None:
     """程序入口"""
+    # 直接启动界面时（未经 main.py）也要初始化日志，否则配置更新的提示不会显示
+    if not logging.getLogger().handlers:
+        setup_logger()
+
     app = MainWindow()
     app.run()
 
@@ -15,6 +15,8 @@ from tkinter import ttk, messagebox, filedialog
 from typing import Dict, Optional, Union, Callable
 from ttkthemes import ThemedStyle
 import threading
+import time
+import traceback
 import sys
 import os
 
@@ -23,6 +25,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.utils.config_updater import ConfigUpdater, PROTECTED_SCENE_NAMES
 import yaml
 
+# 优先使用 libyaml 的 C 实现解析场景配置
+try:
+    from yaml import CSafeLoader as _YLoader
+except ImportError:
+    from yaml import SafeLoader as _YLoader
+
 
 class SettingsPanel:
     """设置面板类 - 左侧导航右侧内容的双栏布局"""
@@ -201,7 +209,7 @@ class SettingsPanel:
                 return None
 
             with open(config_path, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YLoader)
 
             if not config or "scenarios" not in config:
                 return None
@@ -831,14 +839,18 @@ class SettingsPanel:
 
             def generate_scene_config():
                 """在后台线程中生成场景配置"""
-                import time
-
-                timeout_seconds = 35  # 稍长于 ConfigUpdater 的超时时间
                 start_time = time.time()
 
                 try:
                     # 复用已初始化的 config_updater
                     config_updater = self._config_updater
+                    # 按最坏情况的整条 AI 调用链估算（批量请求 + 单场景回退各一次 API 超时，
+                    # 再加场景名翻译），另留余量；只有超过整条链的时长才判定为超时
+                    timeout_seconds = (
+                        2 * config_updater.API_TIMEOUT
+                        + config_updater.TRANSLATION_TIMEOUT
+                        + 5
+                    )
 
                     # 获取当前场景数量（用于计算阈值）
                     current_config = config_updater.load_current_config()
@@ -851,7 +863,7 @@ class SettingsPanel:
 
                     # 检查是否超时
                     elapsed = time.time() - start_time
-                    if scene_config is None and elapsed > timeout_seconds * 0.8:
+                    if scene_config is None and elapsed > timeout_seconds:
                         # 超时情况：显示提示框并关闭窗口
                         dialog.after(0, lambda: on_timeout())
                         return
@@ -1005,8 +1017,6 @@ class SettingsPanel:
                     f"删除配置文件时出错：\n{str(e)}",
                 )
                 print(f"删除场景配置失败: {e}")
-                import traceback
-
                 traceback.print_exc()
                 return
 
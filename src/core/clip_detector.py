@@ -20,14 +20,27 @@ CLIP检测器模块
 import logging
 from typing import Dict, List, Union, Optional, Tuple
 from collections import deque
+from pathlib import Path
 import numpy as np
+import yaml
 from PIL import Image
 
 from ..models.clip_wrapper import CLIPWrapper
 from ..utils.translator import ChineseTranslator
 
+# 优先使用 libyaml 的 C 实现，不可用时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as _YLoader
+except ImportError:
+    from yaml import SafeLoader as _YLoader
+
 logger = logging.getLogger(__name__)
 
+# 默认场景配置文件：项目根目录/config/detection/default.yaml（模块加载时计算一次）
+_DEFAULT_DETECTION_CONFIG = (
+    Path(__file__).parent.parent.parent / "config" / "detection" / "default.yaml"
+)
+
 
 class ScenarioConfig:
     """场景配置类"""
@@ -480,15 +493,10 @@ class CLIPDetector:
         Returns:
             是否成功重载
         """
-        import yaml
-        from pathlib import Path
-        
         try:
             # 确定配置文件路径
             if config_path is None:
-                # 默认路径：项目根目录/config/detection/default.yaml
-                project_root = Path(__file__).parent.parent.parent
-                config_path = project_root / "config" / "detection" / "default.yaml"
+                config_path = _DEFAULT_DETECTION_CONFIG
             else:
                 config_path = Path(config_path)
             
@@ -496,9 +504,8 @@ class CLIPDetector:
                 logger.error(f"配置文件不存在: {config_path}")
                 return False
             
-            # 读取 YAML 配置
-            with open(config_path, 'r', encoding='utf-8') as f:
-                detection_config = yaml.safe_load(f)
+            # 读取 YAML 配置（整个文件读为字节后交给 libyaml 解析）
+            detection_config = yaml.load(config_path.read_bytes(), Loader=_YLoader)
             
             if not detection_config or 'scenarios' not in detection_config:
                 logger.warning("配置文件中没有场景定义")
@@ -22,6 +22,12 @@ from typing import Optional, List
 from pathlib import Path
 import logging
 
+# 优先使用 libyaml 的 C 实现，不可用时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as _YLoader
+except ImportError:
+    from yaml import SafeLoader as _YLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -88,7 +94,7 @@ class VideoCapture:
         
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YLoader)
             logger.info(f"✅ 成功加载配置文件: {config_path}")
             return config
         except Exception as e:
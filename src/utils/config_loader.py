@@ -17,6 +17,12 @@ import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 
+# 优先使用 libyaml 的 C 实现（解析速度快数倍），不可用时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as _YLoader
+except ImportError:
+    from yaml import SafeLoader as _YLoader
+
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """
@@ -47,7 +53,7 @@ def load_config(config_path: str) -> Dict[str, Any]:
     
     # 加载YAML文件
     with open(config_file, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YLoader)
     
     return config if config is not None else {}
 
@@ -16,47 +16,475 @@
 
 import yaml
 import json
+import logging
+import copy
 import re
 import os
-import signal
+import time
+import hashlib
+import importlib.util
+import marshal
+import sys
+import functools
+import threading
+import weakref
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 
-# Gemini API 支持（可选依赖）
-try:
-    import google.generativeai as genai
+if TYPE_CHECKING:
+    # 仅用于类型注解，运行时仍在创建客户端时才导入
+    from openai import OpenAI
 
-    GEMINI_AVAILABLE = True
+logger = logging.getLogger(__name__)
+
+# 优先使用 libyaml 的 C 实现（解析/序列化快 5-10 倍），不可用时回退纯 Python 实现
+try:
+    from yaml import CSafeLoader as _YLoader, CSafeDumper as _YDumper
 except ImportError:
-    GEMINI_AVAILABLE = False
+    from yaml import SafeLoader as _YLoader, SafeDumper as _YDumper
 
-# DeepSeek API 支持（可选依赖）
+# orjson 支持（可选依赖，解析 AI 返回的 JSON 快 2-5 倍）
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，异常处理无需区分
 try:
-    from openai import OpenAI
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-    DEEPSEEK_AVAILABLE = True
+# 文件锁支持（fcntl 仅在类 Unix 系统可用，Windows 下只做进程内互斥）
+try:
+    import fcntl
 except ImportError:
-    DEEPSEEK_AVAILABLE = False
+    fcntl = None
+
+
+# Gemini 预热在进程内只做一次（见 ConfigUpdater._start_gemini_warmup）
+_gemini_warmup_started = False
+_gemini_warmup_lock = threading.Lock()
+
+
+def _module_installed(name: str) -> bool:
+    """只查找模块是否已安装，不实际导入（避免启动时加载重量级依赖）"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# Gemini / DeepSeek API 支持（可选依赖）
+# SDK 导入开销很大（gRPC/protobuf、httpx/pydantic），推迟到真正初始化客户端时才导入
+GEMINI_AVAILABLE = _module_installed("google.generativeai")
+DEEPSEEK_AVAILABLE = _module_installed("openai") and _module_installed("httpx")
+
+
+@functools.lru_cache(maxsize=None)
+def _gemini_module():
+    """按需导入 google.generativeai，未安装或导入失败时返回 None"""
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        return None
+    return genai
+
 
 # 提示用户安装情况
 if not GEMINI_AVAILABLE and not DEEPSEEK_AVAILABLE:
-    print("⚠️  未安装任何 LLM API 支持，AI 生成功能不可用")
-    print("   推荐安装 Gemini: pip install google-generativeai")
-    print("   或安装 DeepSeek: pip install openai")
-
-# 内置场景保护列表（这些场景不能被删除）
-PROTECTED_SCENE_KEYS = {"fall", "fire", "normal"}
-PROTECTED_SCENE_NAMES = {
-    "摔倒",
-    "跌倒",
-    "跌倒检测",  # fall 的别名
-    "起火",
-    "火灾",
-    "火灾检测",  # fire 的别名
-    "正常",
-    "正常场景",  # normal 的别名
+    logger.warning("⚠️  未安装任何 LLM API 支持，AI 生成功能不可用")
+    logger.warning("   推荐安装 Gemini: pip install google-generativeai")
+    logger.warning("   或安装 DeepSeek: pip install openai")
+
+# 内置场景保护列表（这些场景不能被删除；frozenset 防止被导入方意外修改）
+PROTECTED_SCENE_KEYS = frozenset({"fall", "fire", "normal"})
+PROTECTED_SCENE_NAMES = frozenset(
+    {
+        "摔倒",
+        "跌倒",
+        "跌倒检测",  # fall 的别名
+        "起火",
+        "火灾",
+        "火灾检测",  # fire 的别名
+        "正常",
+        "正常场景",  # normal 的别名
+    }
+)
+
+
+# 场景名称 -> 英文键 预定义映射表（同时支持简写和完整名称）
+_KEY_MAP = {
+    "摔倒": "fall",
+    "跌倒": "fall",
+    "跌倒检测": "fall",
+    "起火": "fire",
+    "火灾": "fire",
+    "火灾检测": "fire",
+    "正常": "normal",
+    "正常场景": "normal",
+    "闯入": "intrusion",
+    "入侵": "intrusion",
+    "打架": "fight",
+    "斗殴": "fight",
+    "异常行为": "abnormal_behavior",
+    "攀爬": "climbing",
+    "奔跑": "running",
+    "聚集": "gathering",
+    "徘徊": "wandering",
+    "遗留物": "abandoned_object",
+    "烟雾": "smoke",
+    "求救": "help_signal",
+}
+
+# 内置场景的基础模板（名称、提示词等只维护一份）
+_FALL_TEMPLATE = {
+    "name": "跌倒检测",
+    "prompt": "a person has fallen and is lying on the floor",
+    "prompt_cn": "有人摔倒躺在地上",
+    "threshold": 0.4,
+    "cooldown": 30,
+    "consecutive_frames": 2,
+    "alert_level": "high",
+}
+_FIRE_TEMPLATE = {
+    "name": "火灾检测",
+    "prompt": "flames and fire burning with visible smoke",
+    "prompt_cn": "发生火灾，有火焰和浓烟",
+    "threshold": 0.4,
+    "cooldown": 60,
+    "consecutive_frames": 3,
+    "alert_level": "high",
+}
+_NORMAL_TEMPLATE = {
+    "name": "正常场景",
+    "prompt": "an ordinary indoor room with no emergency",
+    "prompt_cn": "普通室内环境，无异常",
+    "threshold": 0.99,
+    "cooldown": 10,
+    "consecutive_frames": 1,
+    "alert_level": "low",
 }
 
+# 场景名称（含别名）-> 基础模板
+_TEMPLATE_ALIASES = {
+    "摔倒": _FALL_TEMPLATE,
+    "跌倒检测": _FALL_TEMPLATE,
+    "起火": _FIRE_TEMPLATE,
+    "火灾检测": _FIRE_TEMPLATE,
+    "正常": _NORMAL_TEMPLATE,
+    "正常场景": _NORMAL_TEMPLATE,
+}
+
+# 预定义场景模板（作为 AI 不可用时的备选，用于 _generate_scenarios_config）
+# 字段顺序: enabled -> name -> prompt -> prompt_cn -> threshold -> cooldown -> consecutive_frames -> alert_level
+_SCENE_TEMPLATES = {
+    name: {"enabled": tpl is not _NORMAL_TEMPLATE, **tpl}
+    for name, tpl in _TEMPLATE_ALIASES.items()
+}
+
+# 增量更新（update_scenarios）新增场景时使用的预定义模板（非正常场景阈值为 0.5）
+_UPDATE_SCENE_TEMPLATES = {
+    name: tpl if tpl is _NORMAL_TEMPLATE else {**tpl, "threshold": 0.5}
+    for name, tpl in _TEMPLATE_ALIASES.items()
+}
+
+# 映射表与模板只读化，防止被误修改（使用时通过 {**模板, ...} 生成新字典）
+_KEY_MAP = MappingProxyType(_KEY_MAP)
+_SCENE_TEMPLATES = MappingProxyType(
+    {name: MappingProxyType(tpl) for name, tpl in _SCENE_TEMPLATES.items()}
+)
+_UPDATE_SCENE_TEMPLATES = MappingProxyType(
+    {name: MappingProxyType(tpl) for name, tpl in _UPDATE_SCENE_TEMPLATES.items()}
+)
+
+# 配置文件的进程内锁（同一进程内多个 ConfigUpdater 实例共享）
+_CONFIG_LOCKS: Dict[str, threading.Lock] = {}
+_CONFIG_LOCKS_GUARD = threading.Lock()
+
+# 预编译正则表达式
+_NON_KEY_CHARS = re.compile(r"[^a-z0-9_]")
+_NON_KEY_CHARS_CJK = re.compile(r"[^a-z0-9_\u4e00-\u9fff]")
+_HAN_RANGE = re.compile(r"[\u4e00-\u9fff]")
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# DeepSeek 请求的系统提示词（模块级常量，避免每次调用重复构造）
+_SYSTEM_PROMPT = (
+    "You are a helpful assistant that generates scene detection configurations."
+)
+
+# 单个场景配置生成的提示词模板（用 format_map 填入 scene_name）
+_SCENE_PROMPT = """你是一个视频监控场景检测配置专家。请为以下场景生成一个检测配置。
+
+场景名称（中文）: {scene_name}
+
+请严格按照以下 JSON 格式返回配置（不要添加任何其他文字）:
+{{
+    "name": "场景的中文名称（带'检测'后缀，如'跌倒检测'、'火灾检测'）",
+    "prompt": "用于CLIP模型的英文描述，描述该场景的视觉特征，简洁准确，10-20个英文单词",
+    "prompt_cn": "中文描述，与prompt对应，简洁准确",
+    "cooldown": 冷却时间（秒，10-120之间的整数，紧急场景设短一些）,
+    "consecutive_frames": 连续检测帧数（1-5之间的整数，越紧急越少）,
+    "alert_level": "告警级别（high/medium/low，紧急危险场景用high）"
+}}
+
+参考示例：
+- 跌倒检测: prompt="a person has fallen down and is lying on the ground or floor", alert_level="high"
+- 火灾检测: prompt="flames and fire burning with visible smoke in the scene", alert_level="high"
+- 打架检测: prompt="two or more people fighting, hitting or attacking each other violently", alert_level="high"
+- 闯入检测: prompt="unauthorized person entering restricted area or climbing over fence", alert_level="high"
+
+请确保：
+1. prompt 必须是用于 CLIP 视觉模型的英文描述，应准确描述场景的视觉特征
+2. prompt 要具体、准确，便于视觉模型识别
+3. 根据场景的紧急程度合理设置 cooldown、consecutive_frames 和 alert_level
+4. 只返回 JSON，不要有任何其他内容（包括注释）"""
+
+# 场景名翻译为英文键的提示词模板（用 format_map 填入 scene_name）
+_SCENE_KEY_PROMPT = """将以下中文场景名称翻译为简短的英文键（用于配置文件的键名）。
+要求：全小写，多个单词用下划线连接，简洁明了。
+
+中文场景: {scene_name}
+
+只返回英文键，不要其他内容。
+
+示例:
+- 摔倒 -> fall
+- 起火 -> fire
+- 闯入 -> intrusion
+- 打架 -> fight"""
+
+# .env 文件的一行 KEY=VALUE（忽略空行和 # 开头的注释行）
+_ENV_LINE = re.compile(
+    r"""^[ \t]*([^#\s=][^=\n]*?)[ \t]*=[ \t]*(?:"(.*)"|'(.*)'|["']|(.*?))[ \t]*$""",
+    re.MULTILINE,
+)
+
+# "正常"场景的名称
+_NORMAL_SCENE_NAMES = frozenset({"正常场景", "正常检测"})
+# 用户输入的原始场景名中表示"正常"场景的写法（用于选择阈值）
+_NORMAL_INPUT_NAMES = frozenset({"正常", "普通", "normal"})
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_env_file(path: str, mtime_ns: int) -> Tuple[Tuple[str, str], ...]:
+    """
+    解析 .env 文件（按路径和修改时间缓存，多个 ConfigUpdater 实例不重复解析）
+
+    Args:
+        path: .env 文件路径
+        mtime_ns: 文件修改时间（仅作为缓存键）
+
+    Returns:
+        (键, 值) 元组序列
+    """
+    # 整个文件交给一个正则一次匹配（引号内的值去掉两侧引号，只有一个引号视为空值）
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return tuple(
+        (key, value)
+        for key, dq, sq, raw in _ENV_LINE.findall(text)
+        if (value := dq or sq or raw)
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _dynamic_threshold(total_scenarios: int, is_normal: bool) -> float:
+    """动态阈值计算（纯函数，结果按参数缓存），公式见 ConfigUpdater.calculate_dynamic_threshold"""
+    if is_normal:
+        return 0.99
+
+    # 计算基础阈值：1.5 * (1 / 总场景数)
+    if total_scenarios <= 0:
+        total_scenarios = 1
+
+    base_threshold = 1.5 * (1.0 / total_scenarios)
+
+    # 限制在合理范围内 [0.3, 0.6]
+    threshold = max(0.3, min(0.6, base_threshold))
+
+    # 保留3位小数
+    return round(threshold, 3)
+
+
+# 可直接以 plain 风格输出的字符串 / 键名（保守判断，其余字符串用双引号输出）
+_PLAIN_STR = re.compile(r"[^\s\-?:,\[\]{}#&*!|>'\"%@`0-9+.~=<][^:#\x00-\x1f]*(?<!\s)")
+_PLAIN_KEY = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_FLOAT_TEXT = re.compile(r"-?[0-9]+\.[0-9]+")
+_YAML_RESERVED = frozenset(
+    {"y", "n", "yes", "no", "true", "false", "on", "off", "null"}
+)
+
+
+def _yaml_scalar(value: Any) -> Optional[str]:
+    """
+    将场景字段值转换为 YAML 标量文本
+
+    Args:
+        value: 字段值
+
+    Returns:
+        YAML 文本，类型不在快速路径支持范围内时返回 None
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        text = repr(value)
+        # 科学计数法、inf、nan 交给 PyYAML 处理
+        return text if _FLOAT_TEXT.fullmatch(text) else None
+    if isinstance(value, str):
+        if not value.isprintable():
+            # 含换行等控制字符的字符串交给 PyYAML 处理
+            return None
+        if _PLAIN_STR.fullmatch(value) and value.lower() not in _YAML_RESERVED:
+            return value
+        # JSON 字符串同时也是合法的 YAML 双引号标量
+        return json.dumps(value, ensure_ascii=False)
+    return None
+
+
+def _emit_scenarios_fast(scenarios: Dict[str, Any]) -> Optional[str]:
+    """
+    按 scenarios 的固定结构直接拼接 YAML 文本，跳过 PyYAML 的表示器/解析器
+
+    Args:
+        scenarios: scenarios 配置字典（键 -> 字段字典）
+
+    Returns:
+        YAML 文本（以 "scenarios:" 开头），结构不符合预期时返回 None
+    """
+    if not scenarios:
+        return None
+
+    buf = ["scenarios:\n"]
+    for scene_key, scene_config in scenarios.items():
+        if (
+            not isinstance(scene_key, str)
+            or not _PLAIN_KEY.fullmatch(scene_key)
+            or scene_key.lower() in _YAML_RESERVED
+            or not isinstance(scene_config, dict)
+            or not scene_config
+        ):
+            return None
+        buf.append(f"  {scene_key}:\n")
+        for field, value in scene_config.items():
+            text = _yaml_scalar(value)
+            if (
+                text is None
+                or not isinstance(field, str)
+                or not _PLAIN_KEY.fullmatch(field)
+                or field.lower() in _YAML_RESERVED
+            ):
+                return None
+            buf.append(f"    {field}: {text}\n")
+    return "".join(buf)
+
+
+def _dump_config(config: Dict[str, Any]) -> str:
+    """
+    序列化整个配置：scenarios 走快速路径，其他顶层键仍交给 PyYAML
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        YAML 文本
+    """
+    dump_kwargs = dict(
+        Dumper=_YDumper,
+        allow_unicode=True,
+        default_flow_style=False,
+        sort_keys=False,
+    )
+    fast = _emit_scenarios_fast(config.get("scenarios"))
+    if fast is None:
+        return yaml.dump(config, **dump_kwargs)
+
+    parts = []
+    others: Dict[str, Any] = {}
+    for key, value in config.items():
+        if key == "scenarios":
+            if others:
+                parts.append(yaml.dump(others, **dump_kwargs))
+                others = {}
+            parts.append(fast)
+        else:
+            others[key] = value
+    if others:
+        parts.append(yaml.dump(others, **dump_kwargs))
+    return "".join(parts)
+
+
+_BLOCK_KEY_LINE = re.compile(
+    r"""(?P<indent>[ ]*)(?P<key>[A-Za-z0-9_\-]+|"[^"\\]*"|'[^']*'):[ \t]*(?:#.*)?"""
+)
+_ENABLED_LINE = re.compile(
+    r"(?P<head>[ ]+enabled:[ \t]*)(?P<value>true|false|True|False)(?P<tail>[ \t]*(?:#.*)?)"
+)
+
+
+def _patch_enabled_lines(text: str, changes: Dict[str, bool]) -> Optional[str]:
+    """
+    只改写 scenarios 下指定场景的 enabled 行，保留文件其余内容（包括注释）
+
+    Args:
+        text: 配置文件原文
+        changes: {场景键: 新的 enabled 值}
+
+    Returns:
+        改写后的文本；文件结构不是预期的块格式或有场景未找到时返回 None
+    """
+    lines = text.splitlines(keepends=True)
+    pending = dict(changes)
+    in_scenarios = False
+    scene_indent = field_indent = None
+    current_key = None
+
+    for i, line in enumerate(lines):
+        body = line.rstrip("\r\n")
+        stripped = body.lstrip(" ")
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(body) - len(stripped)
+
+        if indent == 0:
+            # 顶层键：进入或离开 scenarios 段
+            if in_scenarios:
+                break
+            in_scenarios = body.rstrip() == "scenarios:"
+            continue
+        if not in_scenarios:
+            continue
+
+        if scene_indent is None:
+            scene_indent = indent
+        if indent == scene_indent:
+            match = _BLOCK_KEY_LINE.fullmatch(body)
+            if match is None:
+                return None
+            current_key = match.group("key").strip("'\"")
+            field_indent = None
+            continue
+        if indent < scene_indent or current_key is None:
+            return None
+
+        # 只处理场景的直接字段（嵌套更深的 enabled 不是场景开关）
+        if field_indent is None:
+            field_indent = indent
+        if indent != field_indent or current_key not in pending:
+            continue
+        match = _ENABLED_LINE.fullmatch(body)
+        if match is None:
+            if stripped.startswith("enabled:"):
+                return None
+            continue
+        value = "true" if pending.pop(current_key) else "false"
+        lines[i] = match.group("head") + value + match.group("tail") + line[len(body) :]
+
+    return "".join(lines) if not pending else None
+
 
 class ConfigUpdater:
     """配置更新器 - 负责根据用户选择的场景更新配置文件"""
@@ -65,19 +493,56 @@ class ConfigUpdater:
     GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
     DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY", "")
 
-    # API 超时时间（秒）
-    API_TIMEOUT = 30
+    # 模型名称
+    GEMINI_MODEL = "gemini-3-flash-preview"
+    DEEPSEEK_MODEL = "deepseek-chat"
+
+    # API 超时时间（秒）：按典型响应延迟的约 3 倍设置，失败时尽快回退到模板
+    API_TIMEOUT = 10
+    # 场景名翻译的超时时间（秒），输出很短
+    TRANSLATION_TIMEOUT = 5
+    # 单个场景配置的最大生成 token 数（期望的 JSON 约 150 token，留少量余量）
+    AI_MAX_TOKENS = 220
+
+    # AI 响应持久化缓存文件（相对于项目根目录）
+    AI_CACHE_FILE = ".cache/ai_scene_cache.json"
+    # 解析后配置的二进制缓存目录（相对于项目根目录，不放在受版本控制的 config/ 下）
+    CONFIG_CACHE_DIR = ".cache/config"
+
+    # Gemini 与 DeepSeek 均可用时同时请求两者，取先返回的结果（降低尾延迟，但会消耗双份配额）
+    # 默认关闭；通过构造参数 hedge 或环境变量 DLC_AI_HEDGE=1 开启
+    HEDGE_ENABLED = False
+
+    # AI 响应缓存写盘的合并延迟（秒）
+    AI_CACHE_FLUSH_DELAY = 0.5
+
+    # AI 调用线程池大小（复用线程，避免每次调用创建/销毁线程）
+    AI_MAX_WORKERS = 4
 
     # 当前使用的 API 类型
     current_api: str = None  # "gemini", "deepseek", or None
 
-    def __init__(self, config_path: str = "config/detection/default.yaml"):
+    def __init__(
+        self,
+        config_path: str = "config/detection/default.yaml",
+        api_timeout: Optional[float] = None,
+        translation_timeout: Optional[float] = None,
+        hedge: Optional[bool] = None,
+    ):
         """
         初始化配置更新器
 
         Args:
             config_path: 配置文件路径（相对于项目根目录）
+            api_timeout: 场景生成的 API 超时时间（秒），默认使用 API_TIMEOUT
+            translation_timeout: 场景名翻译的 API 超时时间（秒），默认使用 TRANSLATION_TIMEOUT
+            hedge: 是否同时请求 Gemini 和 DeepSeek，默认读取环境变量 DLC_AI_HEDGE
         """
+        if api_timeout is not None:
+            self.API_TIMEOUT = api_timeout
+        if translation_timeout is not None:
+            self.TRANSLATION_TIMEOUT = translation_timeout
+
         # 获取项目根目录
         self.project_root = Path(__file__).parent.parent.parent
         self.config_file = self.project_root / config_path
@@ -85,196 +550,333 @@ class ConfigUpdater:
         # 尝试加载 .env 文件
         self._load_env_file()
 
-        # 确保配置文件存在
-        if not self.config_file.exists():
-            raise FileNotFoundError(f"配置文件不存在: {self.config_file}")
+        # 并行请求消耗双份配额，只在显式开启时启用（.env 中的设置也生效）
+        if hedge is None:
+            hedge = os.environ.get("DLC_AI_HEDGE", "").strip() == "1"
+        self.HEDGE_ENABLED = hedge
+
+        # 确保配置文件存在（一次 stat 同时完成存在性检查）
+        try:
+            os.stat(self.config_file)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"配置文件不存在: {self.config_file}") from None
+
+        # 已解析配置缓存，以 (mtime_ns, size) 为键，文件未变化时跳过读取和解析
+        self._config_cache: Optional[Dict[str, Any]] = None
+        self._config_stat_key: Optional[tuple] = None
+        # 磁盘上配置文件内容的摘要（与 _config_stat_key 对应），用于跳过内容相同的写入
+        self._config_file_digest: Optional[bytes] = None
+        # 场景名称列表缓存：(对应的配置缓存对象, 所有名称, 启用名称)
+        self._scene_names_cache: Optional[Tuple[Dict[str, Any], List, List]] = None
+
+        # 写入锁与序号：保证写入不交错，且较旧的异步写入不会覆盖较新的配置
+        self._save_lock = threading.Lock()
+        self._save_seq = 0
+        self._pending_save: Optional[Future] = None
+
+        # AI 响应缓存（首次访问时从磁盘惰性加载）
+        self._ai_cache_path = self.project_root / self.AI_CACHE_FILE
+        self._ai_cache: Optional[Dict[str, Any]] = None
+        self._ai_cache_lock = threading.Lock()
+        # 延迟写盘的定时器：短时间内的多次写入合并为一次
+        self._ai_cache_flush_timer: Optional[threading.Timer] = None
+
+        # 持久化的 AI 调用线程池（所有 API 调用共用）
+        self._ai_executor = ThreadPoolExecutor(
+            max_workers=self.AI_MAX_WORKERS, thread_name_prefix="ai"
+        )
+        # 实例被回收或解释器退出时关闭线程池（finalize 不持有 self，不会阻止回收）
+        self._ai_executor_finalizer = weakref.finalize(
+            self, self._ai_executor.shutdown, wait=False
+        )
+
+        # 并行请求专用线程池：每个调用方同时占用两个线程，且输掉的请求无法取消、
+        # 会占用线程直到 SDK 超时，因此与共用线程池分开并按调用方并发数的 2 倍配置
+        self._hedge_executor = ThreadPoolExecutor(
+            max_workers=2 * self.AI_MAX_WORKERS, thread_name_prefix="ai-hedge"
+        )
+        self._hedge_executor_finalizer = weakref.finalize(
+            self, self._hedge_executor.shutdown, wait=False
+        )
+        # 记录当前线程最近一次成功调用实际使用的 API（用于按应答模型写入缓存）
+        self._answered_by = threading.local()
 
         # 初始化 LLM 客户端（优先 Gemini，备选 DeepSeek）
         self.ai_client = None
         self.gemini_model = None
         self._init_llm_client()
 
-        print(f"✓ 配置更新器初始化: {self.config_file}")
+        logger.info(f"✓ 配置更新器初始化: {self.config_file}")
 
     def _load_env_file(self) -> None:
         """手动加载 .env 文件（如果存在）"""
         env_path = self.project_root / ".env"
-        if not env_path.exists():
+        try:
+            mtime_ns = os.stat(env_path).st_mtime_ns
+        except OSError:
             return
 
         try:
-            with open(env_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        key = key.strip()
-                        value = value.strip()
-
-                        # 去除引号
-                        if (value.startswith('"') and value.endswith('"')) or (
-                            value.startswith("'") and value.endswith("'")
-                        ):
-                            value = value[1:-1]
-
-                        if key and value:
-                            # 只有当环境变量不存在时才设置，避免覆盖系统环境变量
-                            if key not in os.environ:
-                                os.environ[key] = value
+            for key, value in _parse_env_file(str(env_path), mtime_ns):
+                # 只有当环境变量不存在时才设置，避免覆盖系统环境变量
+                os.environ.setdefault(key, value)
 
             # 更新 API 密钥
             self.GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
             self.DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY", "")
 
         except Exception as e:
-            print(f"⚠️  加载 .env 文件失败: {e}")
+            logger.warning(f"⚠️  加载 .env 文件失败: {e}")
 
     def _init_llm_client(self) -> None:
         """初始化 LLM 客户端（优先 Gemini，备选 DeepSeek）"""
         # 1. 优先尝试 Gemini
-        if GEMINI_AVAILABLE and self.GEMINI_API_KEY:
+        genai = _gemini_module() if self.GEMINI_API_KEY else None
+        if genai is not None:
             try:
                 genai.configure(api_key=self.GEMINI_API_KEY)
-                self.gemini_model = genai.GenerativeModel("gemini-3-flash-preview")
+                self.gemini_model = genai.GenerativeModel(self.GEMINI_MODEL)
                 self.current_api = "gemini"
-                print("✓ Gemini API 初始化成功（优先使用）")
+                logger.info("✓ Gemini API 初始化成功（优先使用）")
+                self._start_gemini_warmup()
+                self._init_hedge_client()
                 return
             except Exception as e:
-                print(f"⚠️  Gemini API 初始化失败: {e}")
+                logger.warning(f"⚠️  Gemini API 初始化失败: {e}")
 
         # 2. 回退到 DeepSeek
         if DEEPSEEK_AVAILABLE and self.DEEPSEEK_API_KEY:
             try:
-                self.ai_client = OpenAI(
-                    api_key=self.DEEPSEEK_API_KEY, base_url="https://api.deepseek.com"
-                )
+                self.ai_client = self._create_deepseek_client()
                 self.current_api = "deepseek"
-                print("✓ DeepSeek API 初始化成功（备选）")
+                logger.info("✓ DeepSeek API 初始化成功（备选）")
                 return
             except Exception as e:
-                print(f"⚠️  DeepSeek API 初始化失败: {e}")
+                logger.warning(f"⚠️  DeepSeek API 初始化失败: {e}")
 
         # 3. 无可用 API
-        print("ℹ️  无可用 LLM API，将使用预定义模板生成配置")
+        logger.info("ℹ️  无可用 LLM API，将使用预定义模板生成配置")
         self.current_api = None
 
+    def _create_deepseek_client(self) -> "OpenAI":
+        """
+        创建 DeepSeek 客户端
+
+        使用按并发数设定的 keep-alive 连接池，并发请求可复用已建立的 TLS 连接，
+        避免每次调用都重新握手。（Gemini 使用默认的 gRPC 传输，单个 HTTP/2 连接已可多路复用）
+
+        Returns:
+            OpenAI 兼容客户端
+        """
+        import httpx
+        from openai import OpenAI
+
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=self.AI_MAX_WORKERS * 2,
+                max_keepalive_connections=self.AI_MAX_WORKERS,
+            ),
+        )
+        return OpenAI(
+            api_key=self.DEEPSEEK_API_KEY,
+            base_url="https://api.deepseek.com",
+            # 不自动重试：timeout 即单次调用的总时限，失败后由调用方回退到模板
+            max_retries=0,
+            http_client=http_client,
+        )
+
+    def _start_gemini_warmup(self) -> None:
+        """
+        在后台线程预热 Gemini（提前完成凭证/连接建立，避免首次调用卡住界面）
+
+        只查询模型信息（models.get），不生成内容、不消耗 token；genai 的连接在进程内
+        共享，因此每个进程只预热一次。设置环境变量 DLC_SKIP_GEMINI_WARMUP=1 可跳过
+        """
+        global _gemini_warmup_started
+        if os.environ.get("DLC_SKIP_GEMINI_WARMUP"):
+            return
+        with _gemini_warmup_lock:
+            if _gemini_warmup_started:
+                return
+            _gemini_warmup_started = True
+
+        genai = _gemini_module()
+        model_name = f"models/{self.GEMINI_MODEL}"
+
+        def warmup():
+            try:
+                genai.get_model(model_name, request_options={"timeout": 5})
+            except Exception:
+                pass  # 预热失败不影响正常使用
+
+        self._ai_executor.submit(warmup)
+
     def _init_deepseek(self) -> None:
         """初始化 DeepSeek API 客户端（兼容旧代码）"""
         if DEEPSEEK_AVAILABLE and self.DEEPSEEK_API_KEY:
             try:
-                self.ai_client = OpenAI(
-                    api_key=self.DEEPSEEK_API_KEY, base_url="https://api.deepseek.com"
-                )
+                self.ai_client = self._create_deepseek_client()
                 self.current_api = "deepseek"
-                print("✓ DeepSeek API 初始化成功")
+                logger.info("✓ DeepSeek API 初始化成功")
             except Exception as e:
-                print(f"⚠️  DeepSeek API 初始化失败: {e}")
+                logger.warning(f"⚠️  DeepSeek API 初始化失败: {e}")
                 self.ai_client = None
 
-    def _call_ai_with_timeout(self, prompt: str, timeout: int = None) -> Optional[str]:
+    def _init_hedge_client(self) -> None:
+        """Gemini 已启用时，再初始化 DeepSeek 客户端作为并行请求的另一方"""
+        if not (self.HEDGE_ENABLED and DEEPSEEK_AVAILABLE and self.DEEPSEEK_API_KEY):
+            return
+        try:
+            self.ai_client = self._create_deepseek_client()
+            logger.info("✓ DeepSeek API 已启用为并行备选")
+        except Exception as e:
+            logger.warning(f"⚠️  DeepSeek API 初始化失败: {e}")
+            self.ai_client = None
+
+    def _call_ai_with_timeout(
+        self,
+        prompt: str,
+        timeout: int = None,
+        max_tokens: int = None,
+        json_mode: bool = False,
+    ) -> Optional[str]:
         """
         带超时的 AI API 调用（自动选择可用的 API）
 
         Args:
             prompt: 提示词
             timeout: 超时时间（秒），默认使用 API_TIMEOUT
+            max_tokens: 最大生成 token 数（仅 DeepSeek 生效），默认使用 AI_MAX_TOKENS
+            json_mode: 是否要求返回单个 JSON 对象（仅 DeepSeek 生效）
 
         Returns:
             响应文本，超时或失败返回 None
         """
         if timeout is None:
             timeout = self.API_TIMEOUT
+        if max_tokens is None:
+            max_tokens = self.AI_MAX_TOKENS
+
+        self._answered_by.api = None
+
+        # 两种 API 都可用时并行请求，取先成功返回的结果
+        if self.HEDGE_ENABLED and self.gemini_model and self.ai_client:
+            return self._call_ai_hedged(prompt, timeout, max_tokens, json_mode)
 
         # 根据当前 API 类型选择调用方式
         if self.current_api == "gemini" and self.gemini_model:
-            return self._call_gemini_with_timeout(prompt, timeout)
+            result = self._call_gemini_with_timeout(prompt, timeout)
         elif self.current_api == "deepseek" and self.ai_client:
-            return self._call_deepseek_with_timeout(prompt, timeout)
+            result = self._call_deepseek_with_timeout(
+                prompt, timeout, max_tokens, json_mode
+            )
         else:
             return None
+        if result:
+            self._answered_by.api = self.current_api
+        return result
 
-    def _call_gemini_with_timeout(self, prompt: str, timeout: int) -> Optional[str]:
+    def _call_ai_hedged(
+        self, prompt: str, timeout: float, max_tokens: int, json_mode: bool = False
+    ) -> Optional[str]:
         """
-        带超时的 Gemini API 调用
+        同时请求 Gemini 和 DeepSeek，返回先成功的结果并取消另一个
 
         Args:
             prompt: 提示词
             timeout: 超时时间（秒）
+            max_tokens: 最大生成 token 数（仅 DeepSeek 生效）
+            json_mode: 是否要求返回单个 JSON 对象（仅 DeepSeek 生效）
 
         Returns:
-            响应文本，超时或失败返回 None
+            响应文本，均超时或失败返回 None
         """
-        from concurrent.futures import (
-            ThreadPoolExecutor,
-            TimeoutError as FutureTimeoutError,
-        )
+        # 截止时间在提交前确定（包括在线程池中排队的时间），总等待不超过 timeout
+        deadline = time.monotonic() + timeout
+        submit = self._hedge_executor.submit
+        apis = {
+            submit(self._call_gemini_with_timeout, prompt, timeout): "gemini",
+            submit(
+                self._call_deepseek_with_timeout,
+                prompt,
+                timeout,
+                max_tokens,
+                json_mode,
+            ): "deepseek",
+        }
+        pending = set(apis)
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(
+                    pending, timeout=remaining, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    # 两个调用函数内部已捕获异常，失败时返回 None
+                    result = future.result()
+                    if result:
+                        self._answered_by.api = apis[future]
+                        return result
+            return None
+        finally:
+            for future in pending:
+                future.cancel()
 
-        def call_api():
-            try:
-                response = self.gemini_model.generate_content(prompt)
-                return response.text.strip()
-            except Exception as e:
-                raise e
+    def _call_gemini_with_timeout(self, prompt: str, timeout: int) -> Optional[str]:
+        """
+        带超时的 Gemini API 调用（使用 SDK 自身的请求超时，超时后连接随之关闭）
+
+        Args:
+            prompt: 提示词
+            timeout: 超时时间（秒）
 
+        Returns:
+            响应文本，超时或失败返回 None
+        """
         try:
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(call_api)
-                try:
-                    result = future.result(timeout=timeout)
-                    return result
-                except FutureTimeoutError:
-                    print(f"   ⏱️  Gemini API 调用超时 ({timeout}秒)")
-                    return None
+            response = self.gemini_model.generate_content(
+                prompt, request_options={"timeout": timeout}
+            )
+            return response.text.strip()
         except Exception as e:
             self._handle_api_error(e, "Gemini")
             return None
 
-    def _call_deepseek_with_timeout(self, prompt: str, timeout: int) -> Optional[str]:
+    def _call_deepseek_with_timeout(
+        self,
+        prompt: str,
+        timeout: int,
+        max_tokens: int = None,
+        json_mode: bool = False,
+    ) -> Optional[str]:
         """
-        带超时的 DeepSeek API 调用
+        带超时的 DeepSeek API 调用（使用 SDK 自身的请求超时，超时后连接随之关闭）
 
         Args:
             prompt: 提示词
             timeout: 超时时间（秒）
+            max_tokens: 最大生成 token 数，默认使用 AI_MAX_TOKENS
+            json_mode: 是否使用 JSON 输出模式（强制返回单个 JSON 对象）
 
         Returns:
             响应文本，超时或失败返回 None
         """
-        from concurrent.futures import (
-            ThreadPoolExecutor,
-            TimeoutError as FutureTimeoutError,
-        )
-
-        def call_api():
-            try:
-                response = self.ai_client.chat.completions.create(
-                    model="deepseek-chat",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a helpful assistant that generates scene detection configurations.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    temperature=0.7,
-                    max_tokens=500,
-                )
-                return response.choices[0].message.content.strip()
-            except Exception as e:
-                raise e
-
+        extra_args = {"response_format": {"type": "json_object"}} if json_mode else {}
         try:
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(call_api)
-                try:
-                    result = future.result(timeout=timeout)
-                    return result
-                except FutureTimeoutError:
-                    print(f"   ⏱️  DeepSeek API 调用超时 ({timeout}秒)")
-                    return None
+            response = self.ai_client.chat.completions.create(
+                model=self.DEEPSEEK_MODEL,
+                messages=[
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.7,
+                max_tokens=max_tokens or self.AI_MAX_TOKENS,
+                timeout=timeout,
+                **extra_args,
+            )
+            return response.choices[0].message.content.strip()
         except Exception as e:
             self._handle_api_error(e, "DeepSeek")
             return None
@@ -282,16 +884,131 @@ class ConfigUpdater:
     def _handle_api_error(self, e: Exception, api_name: str) -> None:
         """处理 API 错误信息"""
         error_msg = str(e).lower()
-        if "timeout" in error_msg or "timed out" in error_msg:
-            print(f"   ⏱️  {api_name} API 调用超时")
+        if (
+            "timeout" in error_msg
+            or "timed out" in error_msg
+            or "deadline" in error_msg
+        ):
+            # 超时后会回退到模板/拼音，属于预期情况，记为 INFO 避免反复刷屏
+            logger.info(f"   ⏱️  {api_name} API 调用超时")
         elif "429" in error_msg or "quota" in error_msg:
-            print(f"   ⚠️  {api_name} API 配额已用尽或请求频率过高")
+            logger.warning(f"   ⚠️  {api_name} API 配额已用尽或请求频率过高")
         elif "403" in error_msg or "401" in error_msg:
-            print(f"   ⚠️  {api_name} API 密钥无效或权限不足")
+            logger.warning(f"   ⚠️  {api_name} API 密钥无效或权限不足")
         elif "network" in error_msg or "connection" in error_msg:
-            print(f"   ⚠️  网络连接失败，请检查网络设置")
+            logger.warning(f"   ⚠️  网络连接失败，请检查网络设置")
         else:
-            print(f"   ❌ {api_name} API 调用失败: {type(e).__name__}: {str(e)[:100]}")
+            logger.error(
+                f"   ❌ {api_name} API 调用失败: {type(e).__name__}: {str(e)[:100]}"
+            )
+
+    def _ai_cache_key(self, prompt: str, api: Optional[str] = None) -> str:
+        """
+        根据模型和提示词生成缓存键
+
+        Args:
+            prompt: 提示词
+            api: 给出应答的 API 类型（"gemini"/"deepseek"），默认使用当前 API
+
+        Returns:
+            缓存键
+        """
+        model = {"gemini": self.GEMINI_MODEL, "deepseek": self.DEEPSEEK_MODEL}.get(
+            api or self.current_api, ""
+        )
+        return hashlib.sha256(f"{model}|{prompt}".encode("utf-8")).hexdigest()
+
+    def _ai_cache_apis(self) -> List[Optional[str]]:
+        """可能给出应答的 API 类型（并行请求时两种都可能，当前 API 优先）"""
+        apis = [self.current_api]
+        if self.HEDGE_ENABLED and self.gemini_model and self.ai_client:
+            apis.append("deepseek" if self.current_api == "gemini" else "gemini")
+        return apis
+
+    def _load_ai_cache(self) -> Dict[str, Any]:
+        """惰性加载 AI 响应缓存（调用方需持有 _ai_cache_lock）"""
+        if self._ai_cache is None:
+            self._ai_cache = {}
+            if self._ai_cache_path.exists():
+                try:
+                    with open(self._ai_cache_path, "rb") as f:
+                        self._ai_cache = _json_loads(f.read())
+                except Exception as e:
+                    logger.warning(f"⚠️  加载 AI 缓存失败: {e}")
+        return self._ai_cache
+
+    def _get_cached_ai_response(self, prompt: str) -> Optional[Any]:
+        """
+        查询 AI 响应缓存
+
+        Args:
+            prompt: 提示词
+
+        Returns:
+            缓存的结果（副本），未命中返回 None
+        """
+        with self._ai_cache_lock:
+            cache = self._load_ai_cache()
+            cached = None
+            for api in self._ai_cache_apis():
+                cached = cache.get(self._ai_cache_key(prompt, api))
+                if cached is not None:
+                    break
+        return json.loads(json.dumps(cached)) if cached is not None else None
+
+    def _store_ai_response(self, prompt: str, value: Any) -> None:
+        """
+        写入 AI 响应缓存，并在短暂延迟后持久化（批量生成时多次写入只落盘一次）
+
+        以当前线程最近一次调用实际应答的模型为键，并行请求时不会把 DeepSeek
+        的结果记在 Gemini 名下
+
+        Args:
+            prompt: 提示词
+            value: 可 JSON 序列化的结果
+        """
+        api = getattr(self._answered_by, "api", None)
+        with self._ai_cache_lock:
+            self._load_ai_cache()[self._ai_cache_key(prompt, api)] = value
+            if self._ai_cache_flush_timer is None:
+                # 非守护线程：解释器退出前会等待定时器完成写盘
+                timer = threading.Timer(self.AI_CACHE_FLUSH_DELAY, self.flush_ai_cache)
+                timer.name = "ai-cache-flush"
+                self._ai_cache_flush_timer = timer
+                timer.start()
+
+    def flush_ai_cache(self) -> None:
+        """立即将 AI 响应缓存写入磁盘（先写临时文件再原子替换）"""
+        with self._ai_cache_lock:
+            timer = self._ai_cache_flush_timer
+            self._ai_cache_flush_timer = None
+            if timer is None:
+                return
+            timer.cancel()
+            cache = self._load_ai_cache()
+            try:
+                self._ai_cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self._ai_cache_path.with_suffix(".json.tmp")
+                # 先在内存中序列化，再一次性写入（json.dump 会按片段多次调用 write）
+                payload = json.dumps(cache, ensure_ascii=False).encode("utf-8")
+                with open(tmp, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp, self._ai_cache_path)
+            except Exception as e:
+                logger.warning(f"⚠️  保存 AI 缓存失败: {e}")
+
+    def close(self) -> None:
+        """等待未完成的异步保存并写出 AI 缓存，然后关闭 AI 调用线程池（不等待进行中的请求）"""
+        self.flush_pending_saves()
+        self.flush_ai_cache()
+        finalizer = getattr(self, "_ai_executor_finalizer", None)
+        if finalizer is not None:
+            finalizer()
+            self._ai_executor = None
+        hedge_finalizer = getattr(self, "_hedge_executor_finalizer", None)
+        if hedge_finalizer is not None:
+            hedge_finalizer()
+            self._hedge_executor = None
 
     def is_ai_available(self) -> bool:
         """
@@ -302,31 +1019,281 @@ class ConfigUpdater:
         """
         return self.gemini_model is not None or self.ai_client is not None
 
+    @contextmanager
+    def _config_lock(self):
+        """
+        配置文件的"读取-修改-写入"锁（不可重入）
+
+        进程内用共享的线程锁互斥，跨进程用锁文件上的 flock 互斥，
+        避免界面与后台同时更新配置时丢失修改。
+        """
+        path = str(self.config_file.resolve())
+        with _CONFIG_LOCKS_GUARD:
+            thread_lock = _CONFIG_LOCKS.setdefault(path, threading.Lock())
+
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+
+            lock_file = self.config_file.with_name(f".{self.config_file.name}.lock")
+            with open(lock_file, "a") as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
     def load_current_config(self) -> Dict[str, Any]:
         """
-        加载当前配置文件
+        加载当前配置文件（文件未变化时直接返回缓存的副本）
+
+        Returns:
+            配置字典
+        """
+        return copy.deepcopy(self._load_cached_config())
+
+    def _load_cached_config(self) -> Dict[str, Any]:
+        """
+        返回缓存的配置对象本身（不复制，调用方不得修改），文件变化时重新解析
 
         Returns:
             配置字典
         """
-        with open(self.config_file, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
-        return config if config is not None else {}
+        st = os.stat(self.config_file)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if self._config_cache is not None and stat_key == self._config_stat_key:
+            return self._config_cache
+
+        # 整个文件一次读为字节；内容与二进制缓存一致时跳过 YAML 解析
+        data = self.config_file.read_bytes()
+        digest = self._config_digest(data)
+        config = self._read_config_sidecar(digest)
+        if config is None:
+            # 交给 libyaml 解析，省去文本模式的解码包装层
+            config = yaml.load(data, Loader=_YLoader)
+            config = config if config is not None else {}
+            self._write_config_sidecar(digest, config)
+
+        self._config_cache = config
+        self._config_stat_key = stat_key
+        self._config_file_digest = digest
+        return config
 
     def save_config(self, config: Dict[str, Any]) -> None:
         """
-        保存配置到文件
+        保存配置到文件（先写临时文件再原子替换，避免写入中断导致配置损坏）
 
         Args:
             config: 配置字典
         """
-        with open(self.config_file, "w", encoding="utf-8") as f:
-            yaml.safe_dump(
-                config, f, allow_unicode=True, default_flow_style=False, sort_keys=False
-            )
+        with self._save_lock:
+            self._save_seq += 1
+            self._write_config(config)
+
+    def save_config_async(self, config: Dict[str, Any]) -> Future:
+        """
+        在后台线程保存配置，立即返回
+
+        内存缓存会立即更新，因此后续 load_current_config 能读到新配置；
+        但直接读取文件的组件（如检测器热重载）需要先等待返回的 Future。
+
+        Args:
+            config: 配置字典
+
+        Returns:
+            写入任务的 Future
+        """
+        snapshot = copy.deepcopy(config)
+        with self._save_lock:
+            self._save_seq += 1
+            seq = self._save_seq
+            st = os.stat(self.config_file)
+            self._config_cache = snapshot
+            self._config_stat_key = (st.st_mtime_ns, st.st_size)
+        future = self._ai_executor.submit(self._save_config_sync, snapshot, seq)
+        self._pending_save = future
+        return future
+
+    def _save_config_sync(self, config: Dict[str, Any], seq: int) -> None:
+        """异步保存的工作函数（已有更新的保存请求时跳过）"""
+        with self._config_lock(), self._save_lock:
+            if seq != self._save_seq:
+                return
+            self._write_config(config)
+
+    def flush_pending_saves(self) -> None:
+        """等待最近一次异步保存完成"""
+        future = getattr(self, "_pending_save", None)
+        if future is not None:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"❌ 异步保存配置失败: {e}")
+            self._pending_save = None
+
+    def _write_config(self, config: Dict[str, Any]) -> None:
+        """将配置写入文件并刷新缓存（调用方需持有 _save_lock）"""
+        # 先在内存中序列化，再用一次 write 写入临时文件
+        self._write_config_bytes(_dump_config(config).encode("utf-8"), config)
+
+    def _write_config_bytes(self, payload: bytes, config: Dict[str, Any]) -> None:
+        """
+        原子写入已序列化的配置并刷新缓存（调用方需持有 _save_lock）
+
+        Args:
+            payload: 配置文件的完整内容
+            config: 与 payload 对应的配置字典
+        """
+        digest = self._config_digest(payload)
+
+        # 内容与磁盘上的文件完全相同（且文件未被外部修改）时不重写文件
+        if digest == self._config_file_digest:
+            st = os.stat(self.config_file)
+            if (st.st_mtime_ns, st.st_size) == self._config_stat_key:
+                self._config_cache = copy.deepcopy(config)
+                return
+
+        # 临时文件名带上进程/线程号，多个 ConfigUpdater 实例同时保存时互不覆盖
+        tmp = self.config_file.with_name(
+            f".{self.config_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(tmp, flags, 0o644)
+        try:
+            try:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view) :]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp, self.config_file)
+        except BaseException:
+            # 写入失败时清理临时文件，原配置文件保持不变
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+        # 用刚写入的内容刷新缓存，下次加载无需重新解析
+        st = os.stat(self.config_file)
+        self._config_cache = copy.deepcopy(config)
+        self._config_stat_key = (st.st_mtime_ns, st.st_size)
+        self._config_file_digest = digest
+        self._write_config_sidecar(digest, self._config_cache)
+
+    def _patch_enabled_inplace(
+        self, changes: Dict[str, bool], config: Dict[str, Any]
+    ) -> bool:
+        """
+        只改写文件中变化场景的 enabled 行，不重新序列化整个配置
+
+        Args:
+            changes: {场景键: 新的 enabled 值}
+            config: 修改后的完整配置字典（用于刷新缓存）
+
+        Returns:
+            是否已写入；文件格式无法定位时返回 False，调用方应改用 save_config
+        """
+        # 还有未完成的异步保存时，磁盘上的文件不是最新内容
+        pending = self._pending_save
+        if pending is not None and not pending.done():
+            return False
+
+        with self._save_lock:
+            data = self.config_file.read_bytes()
+            # 文件已被外部修改（与缓存不一致）时不做局部改写
+            if self._config_digest(data) != self._config_file_digest:
+                return False
+            try:
+                text = data.decode("utf-8")
+            except UnicodeDecodeError:
+                return False
+            patched = _patch_enabled_lines(text, changes)
+            if patched is None:
+                return False
+            self._save_seq += 1
+            self._write_config_bytes(patched.encode("utf-8"), config)
+            return True
+
+    @staticmethod
+    def _config_digest(data: bytes) -> bytes:
+        """计算配置文件内容的摘要（用于校验二进制缓存）"""
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _config_sidecar_path(self) -> Path:
+        """配置文件的二进制缓存路径（位于 .cache/config/，按配置文件路径区分）"""
+        path_hash = hashlib.blake2b(
+            str(self.config_file.resolve()).encode("utf-8"), digest_size=8
+        ).hexdigest()
+        return (
+            self.project_root
+            / self.CONFIG_CACHE_DIR
+            / f"{self.config_file.stem}_{path_hash}.marshal"
+        )
+
+    @staticmethod
+    def _config_sidecar_header(digest: bytes) -> bytes:
+        """二进制缓存的文件头：内容摘要 + Python 版本（marshal 格式随版本变化）"""
+        return digest + b"py%d.%d:" % sys.version_info[:2]
+
+    def _read_config_sidecar(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        """
+        读取二进制缓存（marshal 格式，只含基本类型，加载时不会执行代码）
+
+        Args:
+            digest: 当前配置文件内容的摘要
+
+        Returns:
+            摘要匹配时返回配置字典，否则返回 None
+        """
+        try:
+            blob = self._config_sidecar_path().read_bytes()
+        except OSError:
+            return None
+        header = self._config_sidecar_header(digest)
+        if blob[: len(header)] != header:
+            return None
+        try:
+            config = marshal.loads(blob[len(header) :])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return config if isinstance(config, dict) else None
+
+    def _write_config_sidecar(self, digest: bytes, config: Dict[str, Any]) -> None:
+        """
+        写入二进制缓存（失败时静默跳过，不影响正常读写）
+
+        Args:
+            digest: 配置文件内容的摘要
+            config: 解析后的配置字典
+        """
+        try:
+            blob = self._config_sidecar_header(digest) + marshal.dumps(config)
+        except ValueError:
+            # 含 marshal 不支持的类型（如日期），不做缓存
+            return
+        sidecar = self._config_sidecar_path()
+        tmp = sidecar.with_name(
+            f"{sidecar.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(blob)
+            os.replace(tmp, sidecar)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
 
     def update_scenarios(
-        self, all_scenes: List[str], selected_scenes: List[str]
+        self,
+        all_scenes: List[str],
+        selected_scenes: List[str],
+        async_save: bool = False,
     ) -> bool:
         """
         增量式更新场景配置（只修改 enabled 字段，保留其他配置）
@@ -334,126 +1301,157 @@ class ConfigUpdater:
         Args:
             all_scenes: 所有可用的场景列表（场景名称，如 ["跌倒检测", "火灾检测"]）
             selected_scenes: 用户勾选（启用）的场景列表
+            async_save: 是否在后台线程写入文件（调用后需立即读取文件的场景请保持 False）
 
         Returns:
             更新是否成功
         """
         try:
-            # 1. 加载当前配置
-            config = self.load_current_config()
-            scenarios = config.get("scenarios", {})
-
-            # 2. 增量更新：只修改 enabled 字段
-            updated_count = 0
-            for scene_key, scene_config in scenarios.items():
-                scene_name = scene_config.get("name", "")
-                should_enable = scene_name in selected_scenes
-
-                # normal 场景特殊保护：始终保持 alert_level: low
-                if scene_key == "normal":
-                    scene_config["alert_level"] = "low"
-
-                if scene_config.get("enabled") != should_enable:
-                    scene_config["enabled"] = should_enable
-                    updated_count += 1
-
-            # 3. 检查是否有新场景需要添加
-            existing_names = {s.get("name") for s in scenarios.values()}
-            for scene_name in all_scenes:
-                if scene_name not in existing_names:
-                    # 新场景：尝试生成配置
-                    scene_key = self._generate_scene_key(scene_name)
-                    new_config = self._get_or_generate_scene_config(
-                        scene_name, scene_name in selected_scenes
-                    )
-                    scenarios[scene_key] = new_config
-                    updated_count += 1
-                    print(f"  ➕ 新增场景: {scene_name}")
+            # 转为集合一次，循环内 O(1) 判断是否启用
+            enabled_set = frozenset(selected_scenes)
+            # 新场景的配置（可能调用 AI，耗时数秒）在锁外生成：{场景名: (英文键, 配置)}
+            built: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+            while True:
+                missing = [
+                    name
+                    for name in self._find_new_scenes(all_scenes)
+                    if name not in built
+                ]
+                built.update(self._build_new_scenes(missing, enabled_set))
 
-            # 4. 保存配置
-            config["scenarios"] = scenarios
-            self.save_config(config)
+                # 锁内只做"重新读取-合并-写入"，不做任何网络请求
+                with self._config_lock():
+                    # 1. 加载当前配置
+                    config = self.load_current_config()
+                    scenarios = config.get("scenarios", {})
 
-            if updated_count > 0:
-                enabled = [
-                    s.get("name") for s in scenarios.values() if s.get("enabled")
-                ]
-                print(f"✅ 场景配置已更新，启用: {', '.join(enabled)}")
+                    # 等待期间配置被其他线程/进程修改，出现了尚未生成的新场景：释放锁后补充生成
+                    new_scenes = self._find_new_scenes(all_scenes, scenarios)
+                    if any(name not in built for name in new_scenes):
+                        continue
 
-            return True
+                    # 2. 增量更新：只修改 enabled 字段
+                    updated_count = 0
+                    # 只有 enabled 变化时记录下来，保存时可只改写对应行
+                    enabled_changes: Dict[str, bool] = {}
+                    for scene_key, scene_config in scenarios.items():
+                        scene_name = scene_config.get("name", "")
+                        should_enable = scene_name in enabled_set
+
+                        # normal 场景特殊保护：始终保持 alert_level: low
+                        if (
+                            scene_key == "normal"
+                            and scene_config.get("alert_level") != "low"
+                        ):
+                            scene_config["alert_level"] = "low"
+                            updated_count += 1
+
+                        if scene_config.get("enabled") != should_enable:
+                            scene_config["enabled"] = should_enable
+                            enabled_changes[scene_key] = should_enable
+                            updated_count += 1
+
+                    # 3. 添加新场景（配置已在锁外生成）
+                    for scene_name in new_scenes:
+                        scene_key, new_config = built[scene_name]
+                        scenarios[scene_key] = new_config
+                        updated_count += 1
+                        logger.info(f"  ➕ 新增场景: {scene_name}")
+
+                    # 4. 配置无变化时直接返回，不重写文件
+                    if updated_count == 0:
+                        logger.info("ℹ️  场景配置无变化，跳过保存")
+                        return True
+
+                    # 5. 保存配置（只有 enabled 变化时优先局部改写文件）
+                    config["scenarios"] = scenarios
+                    only_enabled = updated_count == len(enabled_changes)
+                    if not (
+                        only_enabled
+                        and self._patch_enabled_inplace(enabled_changes, config)
+                    ):
+                        if async_save:
+                            self.save_config_async(config)
+                        else:
+                            self.save_config(config)
+
+                    enabled = [
+                        s.get("name") for s in scenarios.values() if s.get("enabled")
+                    ]
+                    logger.info(f"✅ 场景配置已更新，启用: {', '.join(enabled)}")
+
+                    return True
 
         except Exception as e:
-            print(f"❌ 更新场景配置失败: {e}")
+            logger.error(f"❌ 更新场景配置失败: {e}")
             return False
 
+    def _find_new_scenes(
+        self,
+        all_scenes: List[str],
+        scenarios: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        找出配置中尚不存在的场景名
+
+        Args:
+            all_scenes: 所有可用的场景列表
+            scenarios: 场景配置，默认读取当前配置文件
+
+        Returns:
+            新场景名列表（保持原始顺序并去重）
+        """
+        if scenarios is None:
+            scenarios = self._load_cached_config().get("scenarios", {})
+        # 用集合差一次求出新场景（保持原始顺序并去重，避免重复生成）
+        existing_names = {s.get("name") for s in scenarios.values()}
+        return [
+            name for name in dict.fromkeys(all_scenes) if name not in existing_names
+        ]
+
+    def _build_new_scenes(
+        self, new_scenes: List[str], enabled_set: frozenset
+    ) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        为新场景生成英文键和配置（可能调用 AI，调用方不应持有配置锁）
+
+        Args:
+            new_scenes: 新场景名列表
+            enabled_set: 启用的场景名集合
+
+        Returns:
+            {场景名: (英文键, 配置)}
+        """
+
+        def build_new_scene(scene_name: str) -> Tuple[str, Dict[str, Any]]:
+            # 新场景：生成英文键并尝试生成配置
+            return (
+                self._generate_scene_key(scene_name),
+                self._get_or_generate_scene_config(
+                    scene_name, scene_name in enabled_set
+                ),
+            )
+
+        # 多个新场景的 AI 请求并发执行（map 保持原始顺序）
+        if len(new_scenes) > 1 and self.is_ai_available():
+            with ThreadPoolExecutor(
+                max_workers=min(self.AI_MAX_WORKERS, len(new_scenes)),
+                thread_name_prefix="ai-scene",
+            ) as scene_executor:
+                built = list(scene_executor.map(build_new_scene, new_scenes))
+        else:
+            built = [build_new_scene(name) for name in new_scenes]
+        return dict(zip(new_scenes, built))
+
     def _get_or_generate_scene_config(
         self, scene_name: str, enabled: bool = True
     ) -> Dict[str, Any]:
         """
         获取或生成场景配置（优先使用模板，其次AI，最后默认）
         """
-        # 预定义模板
-        templates = {
-            "跌倒检测": {
-                "name": "跌倒检测",
-                "prompt": "a person has fallen and is lying on the floor",
-                "prompt_cn": "有人摔倒躺在地上",
-                "threshold": 0.5,
-                "cooldown": 30,
-                "consecutive_frames": 2,
-                "alert_level": "high",
-            },
-            "火灾检测": {
-                "name": "火灾检测",
-                "prompt": "flames and fire burning with visible smoke",
-                "prompt_cn": "发生火灾，有火焰和浓烟",
-                "threshold": 0.5,
-                "cooldown": 60,
-                "consecutive_frames": 3,
-                "alert_level": "high",
-            },
-            "正常场景": {
-                "name": "正常场景",
-                "prompt": "an ordinary indoor room with no emergency",
-                "prompt_cn": "普通室内环境，无异常",
-                "threshold": 0.99,
-                "cooldown": 10,
-                "consecutive_frames": 1,
-                "alert_level": "low",
-            },
-            "摔倒": {
-                "name": "跌倒检测",
-                "prompt": "a person has fallen and is lying on the floor",
-                "prompt_cn": "有人摔倒躺在地上",
-                "threshold": 0.5,
-                "cooldown": 30,
-                "consecutive_frames": 2,
-                "alert_level": "high",
-            },
-            "起火": {
-                "name": "火灾检测",
-                "prompt": "flames and fire burning with visible smoke",
-                "prompt_cn": "发生火灾，有火焰和浓烟",
-                "threshold": 0.5,
-                "cooldown": 60,
-                "consecutive_frames": 3,
-                "alert_level": "high",
-            },
-            "正常": {
-                "name": "正常场景",
-                "prompt": "an ordinary indoor room with no emergency",
-                "prompt_cn": "普通室内环境，无异常",
-                "threshold": 0.99,
-                "cooldown": 10,
-                "consecutive_frames": 1,
-                "alert_level": "low",
-            },
-        }
-
-        if scene_name in templates:
-            config = templates[scene_name].copy()
-            config["enabled"] = enabled
-            return config
+        if scene_name in _UPDATE_SCENE_TEMPLATES:
+            return {**_UPDATE_SCENE_TEMPLATES[scene_name], "enabled": enabled}
 
         # 尝试 AI 生成
         ai_config = self.generate_scene_with_ai(scene_name)
@@ -491,98 +1489,92 @@ class ConfigUpdater:
         - enabled字段根据用户是否勾选来设置（True/False）
         - 优先使用 Gemini API 生成配置，如不可用则使用模板
         """
-        print(f"\n🤖 正在生成场景配置...")
+        logger.info(f"🤖 正在生成场景配置...")
 
         scenarios = {}
+        enabled_set = frozenset(selected_scenes)
+
+        # 第一遍：先用一次批量请求生成所有自定义场景的配置
+        custom_scenes = [
+            name for name in dict.fromkeys(all_scenes) if name not in _SCENE_TEMPLATES
+        ]
+        ai_configs, ai_reached, batch_parsed = self._generate_scenes_batch_with_ai(
+            custom_scenes
+        )
 
-        # 预定义场景模板（作为 Gemini 不可用时的备选）
-        # 字段顺序: enabled -> name -> prompt -> prompt_cn -> threshold -> cooldown -> consecutive_frames -> alert_level
-        scene_templates = {
-            "摔倒": {
-                "enabled": True,
-                "name": "跌倒检测",
-                "prompt": "a person has fallen and is lying on the floor",
-                "prompt_cn": "有人摔倒躺在地上",
-                "threshold": 0.4,
-                "cooldown": 30,
-                "consecutive_frames": 2,
-                "alert_level": "high",
-            },
-            "跌倒检测": {
-                "enabled": True,
-                "name": "跌倒检测",
-                "prompt": "a person has fallen and is lying on the floor",
-                "prompt_cn": "有人摔倒躺在地上",
-                "threshold": 0.4,
-                "cooldown": 30,
-                "consecutive_frames": 2,
-                "alert_level": "high",
-            },
-            "起火": {
-                "enabled": True,
-                "name": "火灾检测",
-                "prompt": "flames and fire burning with visible smoke",
-                "prompt_cn": "发生火灾，有火焰和浓烟",
-                "threshold": 0.4,
-                "cooldown": 60,
-                "consecutive_frames": 3,
-                "alert_level": "high",
-            },
-            "火灾检测": {
-                "enabled": True,
-                "name": "火灾检测",
-                "prompt": "flames and fire burning with visible smoke",
-                "prompt_cn": "发生火灾，有火焰和浓烟",
-                "threshold": 0.4,
-                "cooldown": 60,
-                "consecutive_frames": 3,
-                "alert_level": "high",
-            },
-            "正常": {
-                "enabled": False,
-                "name": "正常场景",
-                "prompt": "an ordinary indoor room with no emergency",
-                "prompt_cn": "普通室内环境，无异常",
-                "threshold": 0.99,
-                "cooldown": 10,
-                "consecutive_frames": 1,
-                "alert_level": "low",
-            },
-            "正常场景": {
-                "enabled": False,
-                "name": "正常场景",
-                "prompt": "an ordinary indoor room with no emergency",
-                "prompt_cn": "普通室内环境，无异常",
-                "threshold": 0.99,
-                "cooldown": 10,
-                "consecutive_frames": 1,
-                "alert_level": "low",
-            },
-        }
-
-        # 为所有场景生成配置
+        # 只有批量应答解析成功、但其中缺少的场景才逐个并发请求（总耗时约等于单次请求）；
+        # 批量请求超时/失败或无法解析时不再逐个重试，直接回退到默认配置
+        # 使用独立的小线程池，不占用 self._ai_executor（异步保存等任务仍可及时执行）
+        missing_scenes = (
+            [name for name in custom_scenes if name not in ai_configs]
+            if batch_parsed
+            else []
+        )
+        # 本地无法得到英文键的场景名，其 AI 翻译也一并并发请求（AI 服务无应答时直接用拼音）
+        ai_key_scenes = (
+            [
+                name
+                for name in dict.fromkeys(all_scenes)
+                if self._local_scene_key(name) is None
+            ]
+            if ai_reached
+            else []
+        )
+        ai_futures = {}
+        key_futures = {}
+        if (missing_scenes or ai_key_scenes) and self.is_ai_available():
+            with ThreadPoolExecutor(
+                max_workers=min(
+                    self.AI_MAX_WORKERS, len(missing_scenes) + len(ai_key_scenes)
+                ),
+                thread_name_prefix="ai-scene",
+            ) as scene_executor:
+                ai_futures = {
+                    name: scene_executor.submit(self.generate_scene_with_ai, name)
+                    for name in missing_scenes
+                }
+                key_futures = {
+                    name: scene_executor.submit(self.generate_scene_key_with_ai, name)
+                    for name in ai_key_scenes
+                }
+
+        # 第二遍：按原始顺序为所有场景生成配置（日志先收集，最后一次性输出）
+        log_lines = []
         for scene_name in all_scenes:
             # 生成场景的英文键（小写+下划线）
-            scene_key = self._generate_scene_key(scene_name)
+            if scene_name in key_futures:
+                scene_key = key_futures[scene_name].result()
+            elif not ai_reached:
+                scene_key = self._local_scene_key(
+                    scene_name
+                ) or self._generate_pinyin_key(scene_name)
+            else:
+                scene_key = self._generate_scene_key(scene_name)
 
             # 判断该场景是否被用户启用
-            is_enabled = scene_name in selected_scenes
+            is_enabled = scene_name in enabled_set
 
             # 如果有模板则使用模板
-            if scene_name in scene_templates:
-                scenarios[scene_key] = scene_templates[scene_name].copy()
-                scenarios[scene_key]["enabled"] = is_enabled
+            if scene_name in _SCENE_TEMPLATES:
+                scenarios[scene_key] = {
+                    **_SCENE_TEMPLATES[scene_name],
+                    "enabled": is_enabled,
+                }
                 status = "✅ 启用" if is_enabled else "❌ 禁用"
-                print(f"   {status} {scene_name} -> 使用预定义模板")
+                log_lines.append(f"   {status} {scene_name} -> 使用预定义模板")
             else:
-                # 自定义场景：尝试使用 AI 生成配置
-                ai_config = self.generate_scene_with_ai(scene_name)
+                # 自定义场景：读取批量/并发生成的 AI 配置
+                ai_config = ai_configs.get(scene_name)
+                if ai_config is None and scene_name in ai_futures:
+                    try:
+                        ai_config = ai_futures[scene_name].result()
+                    except Exception as e:
+                        log_lines.append(f"   ❌ AI 生成 '{scene_name}' 配置失败: {e}")
 
                 if ai_config:
-                    scenarios[scene_key] = ai_config
-                    scenarios[scene_key]["enabled"] = is_enabled
+                    scenarios[scene_key] = {**ai_config, "enabled": is_enabled}
                     status = "✅ 启用" if is_enabled else "❌ 禁用"
-                    print(f"   {status} {scene_name} -> 🤖 AI 智能生成")
+                    log_lines.append(f"   {status} {scene_name} -> 🤖 AI 智能生成")
                 else:
                     # AI 失败，使用默认配置
                     scenarios[scene_key] = {
@@ -596,7 +1588,10 @@ class ConfigUpdater:
                         "alert_level": "medium",
                     }
                     status = "✅ 启用" if is_enabled else "❌ 禁用"
-                    print(f"   {status} {scene_name} -> 使用默认配置")
+                    log_lines.append(f"   {status} {scene_name} -> 使用默认配置")
+
+        if log_lines:
+            logger.info("\n".join(log_lines))
 
         return scenarios
 
@@ -616,37 +1611,35 @@ class ConfigUpdater:
         - 正常 -> normal
         - 闯入 -> intrusion
         """
-        # 预定义映射表（同时支持简写和完整名称）
-        key_map = {
-            "摔倒": "fall",
-            "跌倒": "fall",
-            "跌倒检测": "fall",
-            "起火": "fire",
-            "火灾": "fire",
-            "火灾检测": "fire",
-            "正常": "normal",
-            "正常场景": "normal",
-            "闯入": "intrusion",
-            "入侵": "intrusion",
-            "打架": "fight",
-            "斗殴": "fight",
-            "异常行为": "abnormal_behavior",
-            "攀爬": "climbing",
-            "奔跑": "running",
-            "聚集": "gathering",
-            "徘徊": "wandering",
-            "遗留物": "abandoned_object",
-            "烟雾": "smoke",
-            "求救": "help_signal",
-        }
-
-        # 如果在映射表中，直接返回
-        if scene_name in key_map:
-            return key_map[scene_name]
+        # 映射表或纯英文名称可在本地直接得到键，无需调用 AI
+        key = self._local_scene_key(scene_name)
+        if key:
+            return key
 
-        # 否则尝试使用 AI 翻译（支持多种 LLM API）
+        # 只有真正的新中文场景才尝试使用 AI 翻译（支持多种 LLM API）
         return self.generate_scene_key_with_ai(scene_name)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _local_scene_key(scene_name: str) -> Optional[str]:
+        """
+        不借助 AI 在本地生成场景键
+
+        Args:
+            scene_name: 场景名称
+
+        Returns:
+            映射表命中或名称可直接转换为英文键时返回键名，否则返回 None（结果按名称缓存）
+        """
+        if scene_name in _KEY_MAP:
+            return _KEY_MAP[scene_name]
+
+        # 移除空格和特殊字符，转为小写
+        key = _NON_KEY_CHARS_CJK.sub("", scene_name.lower().replace(" ", "_"))
+        if key and not _HAN_RANGE.search(key):
+            return key
+        return None
+
     def add_gemini_support(self, api_key: str) -> None:
         """
         添加 Gemini API 支持（优先使用）
@@ -654,19 +1647,21 @@ class ConfigUpdater:
         Args:
             api_key: Gemini API 密钥
         """
-        if not GEMINI_AVAILABLE:
-            print("❌ google-generativeai 未安装，无法启用 Gemini 支持")
-            print("   安装命令: pip install google-generativeai")
+        genai = _gemini_module()
+        if genai is None:
+            logger.error("❌ google-generativeai 未安装，无法启用 Gemini 支持")
+            logger.error("   安装命令: pip install google-generativeai")
             return
 
         self.GEMINI_API_KEY = api_key
         try:
             genai.configure(api_key=api_key)
-            self.gemini_model = genai.GenerativeModel("gemini-3-flash-preview")
+            self.gemini_model = genai.GenerativeModel(self.GEMINI_MODEL)
             self.current_api = "gemini"
-            print("✓ Gemini API 初始化成功")
+            logger.info("✓ Gemini API 初始化成功")
+            self._start_gemini_warmup()
         except Exception as e:
-            print(f"⚠️  Gemini API 初始化失败: {e}")
+            logger.warning(f"⚠️  Gemini API 初始化失败: {e}")
 
     def add_deepseek_support(self, api_key: str) -> None:
         """
@@ -676,8 +1671,8 @@ class ConfigUpdater:
             api_key: DeepSeek API 密钥
         """
         if not DEEPSEEK_AVAILABLE:
-            print("❌ openai 未安装，无法启用 DeepSeek 支持")
-            print("   安装命令: pip install openai")
+            logger.error("❌ openai 未安装，无法启用 DeepSeek 支持")
+            logger.error("   安装命令: pip install openai")
             return
 
         self.DEEPSEEK_API_KEY = api_key
@@ -700,20 +1695,7 @@ class ConfigUpdater:
         - 正常场景：固定为 0.99
         - 其他场景：1.5 * (1 / 总场景数)，范围限制在 0.3-0.6
         """
-        if is_normal:
-            return 0.99
-
-        # 计算基础阈值：1.5 * (1 / 总场景数)
-        if total_scenarios <= 0:
-            total_scenarios = 1
-
-        base_threshold = 1.5 * (1.0 / total_scenarios)
-
-        # 限制在合理范围内 [0.3, 0.6]
-        threshold = max(0.3, min(0.6, base_threshold))
-
-        # 保留3位小数
-        return round(threshold, 3)
+        return _dynamic_threshold(total_scenarios, bool(is_normal))
 
     def recalculate_all_thresholds(self) -> bool:
         """
@@ -725,68 +1707,160 @@ class ConfigUpdater:
             是否成功更新
         """
         try:
-            config = self.load_current_config()
-            scenarios = config.get("scenarios", {})
+            with self._config_lock():
+                config = self.load_current_config()
+                scenarios = config.get("scenarios", {})
 
-            if not scenarios:
+                if not scenarios:
+                    return True
+
+                # 阈值均未变化时跳过保存
+                if not self._recalculate_thresholds_inplace(scenarios):
+                    return True
+
+                config["scenarios"] = scenarios
+                self.save_config(config)
                 return True
 
-            total_scenarios = len(scenarios)
+        except Exception as e:
+            logger.error(f"❌ 重新计算阈值失败: {e}")
+            return False
 
-            for scene_key, scene_config in scenarios.items():
-                if isinstance(scene_config, dict):
-                    # 判断是否为"正常"场景
-                    is_normal = scene_key == "normal" or scene_config.get(
-                        "name", ""
-                    ) in ["正常场景", "正常检测"]
-                    new_threshold = self.calculate_dynamic_threshold(
-                        total_scenarios, is_normal
-                    )
-                    scene_config["threshold"] = new_threshold
+    def _recalculate_thresholds_inplace(self, scenarios: Dict[str, Any]) -> bool:
+        """
+        就地重新计算场景阈值（不读写文件，供批量操作在一次保存前调用）
 
-                    # 确保 normal 场景的 alert_level 始终为 low
-                    if is_normal:
-                        scene_config["alert_level"] = "low"
+        Args:
+            scenarios: scenarios 配置字典（会被直接修改）
 
-            config["scenarios"] = scenarios
-            self.save_config(config)
-            return True
+        Returns:
+            是否有任何字段发生变化
+        """
+        total_scenarios = len(scenarios)
+        changed = False
+
+        # 总场景数在循环内不变，阈值只有两种取值，提前算好
+        normal_threshold = self.calculate_dynamic_threshold(total_scenarios, True)
+        other_threshold = self.calculate_dynamic_threshold(total_scenarios, False)
+
+        for scene_key, scene_config in scenarios.items():
+            if isinstance(scene_config, dict):
+                # 判断是否为"正常"场景
+                is_normal = (
+                    scene_key == "normal"
+                    or scene_config.get("name", "") in _NORMAL_SCENE_NAMES
+                )
+                new_threshold = normal_threshold if is_normal else other_threshold
+                # 允许浮点误差（手动编辑或 YAML 往返产生的末位差异不触发重写）
+                old_threshold = scene_config.get("threshold")
+                if not (
+                    isinstance(old_threshold, (int, float))
+                    and abs(old_threshold - new_threshold) <= 1e-9
+                ):
+                    scene_config["threshold"] = new_threshold
+                    changed = True
 
-        except Exception as e:
-            print(f"❌ 重新计算阈值失败: {e}")
-            return False
+                # 确保 normal 场景的 alert_level 始终为 low
+                if is_normal and scene_config.get("alert_level") != "low":
+                    scene_config["alert_level"] = "low"
+                    changed = True
+
+        return changed
 
     def _extract_json(self, text: str) -> Optional[Dict[str, Any]]:
         """从文本中提取 JSON"""
-        # 1. 尝试直接解析
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
+        # 1. 尝试直接解析（只有以 { 开头时才可能是 JSON 对象，否则跳过一次必然失败的解析）
+        stripped = text.strip()
+        if stripped.startswith("{"):
+            try:
+                return _json_loads(stripped)
+            except json.JSONDecodeError:
+                pass
 
-        # 2. 尝试提取 markdown 代码块
-        if "```" in text:
+        # 2. 尝试提取 markdown 代码块（单次正则扫描）
+        match = _JSON_FENCE.search(text)
+        if match:
             try:
-                if "```json" in text:
-                    json_text = text.split("```json")[1].split("```")[0].strip()
-                else:
-                    json_text = text.split("```")[1].split("```")[0].strip()
-                return json.loads(json_text)
-            except (IndexError, json.JSONDecodeError):
+                return _json_loads(match.group(1))
+            except json.JSONDecodeError:
                 pass
 
-        # 3. 尝试使用正则提取最外层的 {}
-        try:
-            start = text.find("{")
-            end = text.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                json_text = text[start : end + 1]
-                return json.loads(json_text)
-        except json.JSONDecodeError:
-            pass
+        # 3. 截取最外层的 {}（find/rfind 为 C 实现的线性扫描，无需正则回溯）
+        start = text.find("{")
+        end = text.rfind("}")
+        if start != -1 and end > start:
+            try:
+                return _json_loads(text[start : end + 1])
+            except json.JSONDecodeError:
+                pass
 
         return None
 
+    def _build_scene_prompt(self, scene_name: str) -> str:
+        """构建单个场景的配置生成提示词（也用作 AI 缓存键）"""
+        return _SCENE_PROMPT.format_map({"scene_name": scene_name})
+
+    def _normalize_ai_scene_config(
+        self, config: Dict[str, Any], threshold: float
+    ) -> Dict[str, Any]:
+        """
+        校验并规范化 AI 返回的场景配置
+
+        Args:
+            config: AI 返回的原始配置
+            threshold: 动态计算的阈值（不使用 AI 返回的阈值）
+
+        Returns:
+            按标准字段顺序组织的配置
+
+        Raises:
+            ValueError: 缺少必要字段
+        """
+        # 验证必要字段（threshold 不再由 AI 生成）
+        required_fields = [
+            "name",
+            "prompt",
+            "prompt_cn",
+            "cooldown",
+            "consecutive_frames",
+            "alert_level",
+        ]
+        for field in required_fields:
+            if field not in config:
+                raise ValueError(f"缺少必要字段: {field}")
+
+        alert_level = config.get("alert_level")
+        if alert_level not in ["high", "medium", "low"]:
+            alert_level = "medium"
+
+        # 按照标准顺序重新组织配置，并验证数值范围
+        # 字段顺序: enabled -> name -> prompt -> prompt_cn -> threshold -> cooldown -> consecutive_frames -> alert_level
+        return {
+            "enabled": True,  # 新创建的场景默认启用
+            "name": config["name"],
+            "prompt": config["prompt"],
+            "prompt_cn": config["prompt_cn"],
+            "threshold": threshold,
+            "cooldown": max(10, min(120, int(config.get("cooldown", 30)))),
+            "consecutive_frames": max(
+                1, min(5, int(config.get("consecutive_frames", 2)))
+            ),
+            "alert_level": alert_level,
+        }
+
+    def _cache_ai_scene_config(
+        self, scene_name: str, ordered_config: Dict[str, Any]
+    ) -> None:
+        """写入场景配置缓存（不含与场景数相关的 threshold/enabled）"""
+        self._store_ai_response(
+            self._build_scene_prompt(scene_name),
+            {
+                k: v
+                for k, v in ordered_config.items()
+                if k not in ("enabled", "threshold")
+            },
+        )
+
     def generate_scene_with_ai(
         self, scene_name: str, total_scenarios: int = 3
     ) -> Optional[Dict[str, Any]]:
@@ -801,116 +1875,166 @@ class ConfigUpdater:
             场景配置字典，失败返回 None
         """
         if not self.is_ai_available():
-            print(f"   ⚠️  AI 不可用，无法为 '{scene_name}' 生成智能配置")
+            logger.warning(f"   ⚠️  AI 不可用，无法为 '{scene_name}' 生成智能配置")
             return None
 
         # 预先计算阈值
-        is_normal = scene_name in ["正常", "普通", "normal"]
+        is_normal = scene_name in _NORMAL_INPUT_NAMES
         calculated_threshold = self.calculate_dynamic_threshold(
             total_scenarios + 1, is_normal
         )
 
         try:
             # 构建 prompt
-            prompt = f"""你是一个视频监控场景检测配置专家。请为以下场景生成一个检测配置。
+            prompt = self._build_scene_prompt(scene_name)
 
-场景名称（中文）: {scene_name}
-
-请严格按照以下 JSON 格式返回配置（不要添加任何其他文字）:
-{{
-    "name": "场景的中文名称（带'检测'后缀，如'跌倒检测'、'火灾检测'）",
-    "prompt": "用于CLIP模型的英文描述，描述该场景的视觉特征，简洁准确，10-20个英文单词",
-    "prompt_cn": "中文描述，与prompt对应，简洁准确",
-    "cooldown": 冷却时间（秒，10-120之间的整数，紧急场景设短一些）,
-    "consecutive_frames": 连续检测帧数（1-5之间的整数，越紧急越少）,
-    "alert_level": "告警级别（high/medium/low，紧急危险场景用high）"
-}}
-
-参考示例：
-- 跌倒检测: prompt="a person has fallen down and is lying on the ground or floor", alert_level="high"
-- 火灾检测: prompt="flames and fire burning with visible smoke in the scene", alert_level="high"
-- 打架检测: prompt="two or more people fighting, hitting or attacking each other violently", alert_level="high"
-- 闯入检测: prompt="unauthorized person entering restricted area or climbing over fence", alert_level="high"
-
-请确保：
-1. prompt 必须是用于 CLIP 视觉模型的英文描述，应准确描述场景的视觉特征
-2. prompt 要具体、准确，便于视觉模型识别
-3. 根据场景的紧急程度合理设置 cooldown、consecutive_frames 和 alert_level
-4. 只返回 JSON，不要有任何其他内容（包括注释）"""
+            # 优先使用缓存（阈值和 enabled 与场景数相关，命中后重新填充）
+            cached = self._get_cached_ai_response(prompt)
+            if cached is not None:
+                logger.info(f"   ⚡ 使用缓存的 AI 配置: {scene_name}")
+                return self._normalize_ai_scene_config(cached, calculated_threshold)
 
             api_name = self.current_api.upper() if self.current_api else "AI"
-            print(
+            logger.info(
                 f"   📡 正在调用 {api_name} API 为 '{scene_name}' 生成配置（超时: {self.API_TIMEOUT}秒）..."
             )
 
             # 使用带超时的 AI API 调用
-            response_text = self._call_ai_with_timeout(prompt)
+            response_text = self._call_ai_with_timeout(prompt, json_mode=True)
 
             if response_text is None:
-                print(f"   ⚠️  AI 响应超时或失败，将使用默认配置")
+                logger.warning(f"   ⚠️  AI 响应超时或失败，将使用默认配置")
                 return None
 
             # 解析 JSON
             config = self._extract_json(response_text)
 
             if config is None:
-                print(f"   ⚠️  无法解析 AI 返回的 JSON 配置")
+                logger.warning(f"   ⚠️  无法解析 AI 返回的 JSON 配置")
                 return None
 
-            # 验证必要字段（threshold 不再由 Gemini 生成）
-            required_fields = [
-                "name",
-                "prompt",
-                "prompt_cn",
-                "cooldown",
-                "consecutive_frames",
-                "alert_level",
-            ]
-            for field in required_fields:
-                if field not in config:
-                    raise ValueError(f"缺少必要字段: {field}")
-
-            # 使用动态计算的阈值（不使用 Gemini 返回的阈值）
-            config["threshold"] = calculated_threshold
-
-            # 验证其他数值范围
-            config["cooldown"] = max(10, min(120, int(config.get("cooldown", 30))))
-            config["consecutive_frames"] = max(
-                1, min(5, int(config.get("consecutive_frames", 2)))
+            ordered_config = self._normalize_ai_scene_config(
+                config, calculated_threshold
             )
 
-            if config.get("alert_level") not in ["high", "medium", "low"]:
-                config["alert_level"] = "medium"
-
-            # 按照标准顺序重新组织配置
-            # 字段顺序: enabled -> name -> prompt -> prompt_cn -> threshold -> cooldown -> consecutive_frames -> alert_level
-            ordered_config = {
-                "enabled": True,  # 新创建的场景默认启用
-                "name": config["name"],
-                "prompt": config["prompt"],
-                "prompt_cn": config["prompt_cn"],
-                "threshold": config["threshold"],
-                "cooldown": config["cooldown"],
-                "consecutive_frames": config["consecutive_frames"],
-                "alert_level": config["alert_level"],
-            }
+            logger.info(f"   ✅ {api_name} 成功生成配置:")
+            logger.info(f"      - name: {ordered_config['name']}")
+            logger.info(f"      - prompt: {ordered_config['prompt'][:60]}...")
+            logger.info(f"      - threshold: {ordered_config['threshold']} (动态计算)")
+            logger.info(f"      - alert_level: {ordered_config['alert_level']}")
 
-            api_name = self.current_api.upper() if self.current_api else "AI"
-            print(f"   ✅ {api_name} 成功生成配置:")
-            print(f"      - name: {ordered_config['name']}")
-            print(f"      - prompt: {ordered_config['prompt'][:60]}...")
-            print(f"      - threshold: {ordered_config['threshold']} (动态计算)")
-            print(f"      - alert_level: {ordered_config['alert_level']}")
+            self._cache_ai_scene_config(scene_name, ordered_config)
 
             return ordered_config
 
         except json.JSONDecodeError as e:
-            print(f"   ❌ AI 返回的 JSON 解析失败: {e}")
+            logger.error(f"   ❌ AI 返回的 JSON 解析失败: {e}")
             return None
         except Exception as e:
-            print(f"   ❌ AI API 调用失败: {e}")
+            logger.error(f"   ❌ AI API 调用失败: {e}")
             return None
 
+    def _generate_scenes_batch_with_ai(
+        self, scene_names: List[str], total_scenarios: int = 3
+    ) -> Tuple[Dict[str, Dict[str, Any]], bool, bool]:
+        """
+        一次 AI 请求为多个场景生成配置（N 个场景只需一次网络往返）
+
+        Args:
+            scene_names: 中文场景名称列表
+            total_scenarios: 当前总场景数（用于计算阈值）
+
+        Returns:
+            (results, reached, parsed)：
+            - results: {场景名称: 场景配置}，AI 未返回或校验失败的场景不包含在内
+            - reached: AI 服务是否正常应答（不可用、超时或网络失败时为 False）
+            - parsed: 批量应答是否解析成功（不需要请求时也为 True）
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        if not self.is_ai_available():
+            return results, False, False
+        if not scene_names:
+            return results, True, True
+
+        # 已缓存的场景直接返回，只请求未命中的场景
+        pending = []
+        for scene_name in scene_names:
+            is_normal = scene_name in _NORMAL_INPUT_NAMES
+            threshold = self.calculate_dynamic_threshold(total_scenarios + 1, is_normal)
+            cached = self._get_cached_ai_response(self._build_scene_prompt(scene_name))
+            if cached is not None:
+                try:
+                    results[scene_name] = self._normalize_ai_scene_config(
+                        cached, threshold
+                    )
+                    continue
+                except (ValueError, TypeError):
+                    pass
+            pending.append((scene_name, threshold))
+
+        if not pending:
+            return results, True, True
+
+        scene_list = "\n".join(f"- {name}" for name, _ in pending)
+        prompt = f"""你是一个视频监控场景检测配置专家。请为以下场景列表中的每个场景分别生成一个检测配置。
+
+场景列表（中文）:
+{scene_list}
+
+请严格按照以下 JSON 格式返回，顶层键为上面列表中的场景名称原文（不要添加任何其他文字）:
+{{
+    "场景名称": {{
+        "name": "场景的中文名称（带'检测'后缀，如'跌倒检测'、'火灾检测'）",
+        "prompt": "用于CLIP模型的英文描述，描述该场景的视觉特征，简洁准确，10-20个英文单词",
+        "prompt_cn": "中文描述，与prompt对应，简洁准确",
+        "cooldown": 冷却时间（秒，10-120之间的整数，紧急场景设短一些）,
+        "consecutive_frames": 连续检测帧数（1-5之间的整数，越紧急越少）,
+        "alert_level": "告警级别（high/medium/low，紧急危险场景用high）"
+    }}
+}}
+
+请确保：
+1. prompt 必须是用于 CLIP 视觉模型的英文描述，应准确描述场景的视觉特征
+2. 根据场景的紧急程度合理设置 cooldown、consecutive_frames 和 alert_level
+3. 只返回 JSON，不要有任何其他内容（包括注释）"""
+
+        api_name = self.current_api.upper() if self.current_api else "AI"
+        # 批量输出更长，超时按场景数适当放宽（最多 3 倍）
+        timeout = self.API_TIMEOUT * min(len(pending), 3)
+        logger.info(
+            f"   📡 正在调用 {api_name} API 批量生成 {len(pending)} 个场景配置（超时: {timeout}秒）..."
+        )
+
+        response_text = self._call_ai_with_timeout(
+            prompt,
+            timeout=timeout,
+            max_tokens=self.AI_MAX_TOKENS * len(pending),
+            json_mode=True,
+        )
+        if response_text is None:
+            logger.warning(f"   ⚠️  AI 批量生成超时或失败")
+            return results, False, False
+
+        batch = self._extract_json(response_text)
+        if not isinstance(batch, dict):
+            logger.warning(f"   ⚠️  无法解析 AI 返回的批量 JSON 配置")
+            return results, True, False
+
+        for scene_name, threshold in pending:
+            config = batch.get(scene_name)
+            if not isinstance(config, dict):
+                continue
+            try:
+                ordered_config = self._normalize_ai_scene_config(config, threshold)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"   ⚠️  '{scene_name}' 的批量配置无效: {e}")
+                continue
+            results[scene_name] = ordered_config
+            self._cache_ai_scene_config(scene_name, ordered_config)
+
+        logger.info(f"   ✅ {api_name} 批量生成成功: {len(results)}/{len(scene_names)}")
+        return results, True, True
+
     def generate_scene_key_with_ai(self, scene_name: str) -> str:
         """
         使用 AI 将中文场景名翻译为英文键
@@ -925,29 +2049,28 @@ class ConfigUpdater:
             return self._generate_pinyin_key(scene_name)
 
         try:
-            prompt = f"""将以下中文场景名称翻译为简短的英文键（用于配置文件的键名）。
-要求：全小写，多个单词用下划线连接，简洁明了。
-
-中文场景: {scene_name}
+            prompt = _SCENE_KEY_PROMPT.format_map({"scene_name": scene_name})
 
-只返回英文键，不要其他内容。
-
-示例:
-- 摔倒 -> fall
-- 起火 -> fire
-- 闯入 -> intrusion
-- 打架 -> fight"""
+            cached = self._get_cached_ai_response(prompt)
+            if cached:
+                return cached
 
             # 使用带超时的调用，翻译任务用较短的超时时间
-            response_text = self._call_ai_with_timeout(prompt, timeout=8)
+            response_text = self._call_ai_with_timeout(
+                prompt, timeout=self.TRANSLATION_TIMEOUT
+            )
 
             if response_text is None:
                 return self._generate_pinyin_key(scene_name)
 
             key = response_text.lower().replace(" ", "_")
             # 移除非法字符
-            key = re.sub(r"[^a-z0-9_]", "", key)
-            return key if key else self._generate_pinyin_key(scene_name)
+            key = _NON_KEY_CHARS.sub("", key)
+            if not key:
+                return self._generate_pinyin_key(scene_name)
+
+            self._store_ai_response(prompt, key)
+            return key
 
         except Exception:
             return self._generate_pinyin_key(scene_name)
@@ -962,45 +2085,17 @@ class ConfigUpdater:
         Returns:
             转换后的键名（小写+下划线）
         """
-        # 预定义映射表（同时支持简写和完整名称）
-        key_map = {
-            "摔倒": "fall",
-            "跌倒": "fall",
-            "跌倒检测": "fall",
-            "起火": "fire",
-            "火灾": "fire",
-            "火灾检测": "fire",
-            "正常": "normal",
-            "正常场景": "normal",
-            "闯入": "intrusion",
-            "入侵": "intrusion",
-            "打架": "fight",
-            "斗殴": "fight",
-            "异常行为": "abnormal_behavior",
-            "攀爬": "climbing",
-            "奔跑": "running",
-            "聚集": "gathering",
-            "徘徊": "wandering",
-            "遗留物": "abandoned_object",
-            "烟雾": "smoke",
-            "求救": "help_signal",
-        }
-
-        if scene_name in key_map:
-            return key_map[scene_name]
+        key = self._local_scene_key(scene_name)
+        if key:
+            return key
 
-        # 对于未知场景，使用简单的转换
-        # 移除空格和特殊字符，转为小写
-        key = scene_name.lower().replace(" ", "_")
-        key = re.sub(r"[^a-z0-9_\u4e00-\u9fff]", "", key)
-
-        # 如果还是中文，添加scene_前缀和时间戳
-        if re.search(r"[\u4e00-\u9fff]", key):
-            import time
+        # 如果还是中文，添加scene_前缀和名称摘要
+        # （不用时间戳：批量/并发添加时同一秒内的多个场景会得到相同的键而互相覆盖）
+        if _HAN_RANGE.search(scene_name):
+            digest = hashlib.blake2b(scene_name.encode("utf-8"), digest_size=4)
+            return f"scene_{digest.hexdigest()}"
 
-            key = f"scene_{int(time.time())}"
-
-        return key
+        return ""
 
     def _generate_default_scene_config(
         self, scene_name: str, total_scenarios: int = 3
@@ -1015,7 +2110,7 @@ class ConfigUpdater:
         Returns:
             默认配置字典
         """
-        is_normal = scene_name in ["正常", "普通", "normal"]
+        is_normal = scene_name in _NORMAL_INPUT_NAMES
         threshold = self.calculate_dynamic_threshold(total_scenarios + 1, is_normal)
 
         # 字段顺序: enabled -> name -> prompt -> prompt_cn -> threshold -> cooldown -> consecutive_frames -> alert_level
@@ -1041,28 +2136,47 @@ class ConfigUpdater:
         Returns:
             是否成功添加
         """
+        return self.add_new_scenarios_bulk([(scene_key, scene_config)])
+
+    def add_new_scenarios_bulk(self, items: List[Tuple[str, Dict[str, Any]]]) -> bool:
+        """
+        批量添加新场景（只加载、重算阈值并保存一次）
+
+        Args:
+            items: (场景键名, 场景配置字典) 列表
+
+        Returns:
+            是否成功添加
+        """
+        if not items:
+            return True
+
         try:
-            # 1. 加载当前配置
-            config = self.load_current_config()
+            with self._config_lock():
+                # 1. 加载当前配置
+                config = self.load_current_config()
 
-            # 2. 确保 scenarios 存在
-            if "scenarios" not in config:
-                config["scenarios"] = {}
+                # 2. 确保 scenarios 存在
+                if "scenarios" not in config:
+                    config["scenarios"] = {}
 
-            # 3. 添加场景配置
-            config["scenarios"][scene_key] = scene_config
+                # 3. 添加场景配置
+                scenarios = config["scenarios"]
+                for scene_key, scene_config in items:
+                    scenarios[scene_key] = scene_config
 
-            # 4. 保存配置
-            self.save_config(config)
+                # 4. 重新计算所有场景的阈值（在内存中完成，与添加合并为一次保存）
+                self._recalculate_thresholds_inplace(scenarios)
 
-            # 5. 重新计算所有场景的阈值
-            self.recalculate_all_thresholds()
+                # 5. 保存配置
+                self.save_config(config)
 
-            print(f"✅ 新增场景: {scene_config.get('name', scene_key)}")
-            return True
+                for scene_key, scene_config in items:
+                    logger.info(f"✅ 新增场景: {scene_config.get('name', scene_key)}")
+                return True
 
         except Exception as e:
-            print(f"❌ 添加场景失败: {e}")
+            logger.error(f"❌ 添加场景失败: {e}")
             return False
 
     def delete_scenarios_by_names(self, scene_names: List[str]) -> bool:
@@ -1078,114 +2192,143 @@ class ConfigUpdater:
         # 过滤掉受保护的场景（使用模块级常量）
         deletable_scenes = [s for s in scene_names if s not in PROTECTED_SCENE_NAMES]
         if len(deletable_scenes) < len(scene_names):
-            skipped = set(scene_names) - set(deletable_scenes)
-            print(f"⚠️  跳过内置场景: {', '.join(skipped)}")
+            skipped = PROTECTED_SCENE_NAMES.intersection(scene_names)
+            logger.warning(f"⚠️  跳过内置场景: {', '.join(skipped)}")
 
         if not deletable_scenes:
-            print("⚠️  没有可删除的场景")
+            logger.warning("⚠️  没有可删除的场景")
             return False
 
         try:
-            # 1. 加载当前配置
-            config = self.load_current_config()
-            scenarios = config.get("scenarios", {})
-
-            if not scenarios:
-                print("⚠️  配置文件中没有场景")
-                return False
-
-            # 2. 找到对应的场景键（跳过受保护的键）
-            keys_to_delete = []
-            for scene_name in deletable_scenes:
-                found = False
+            with self._config_lock():
+                # 1. 加载当前配置
+                config = self.load_current_config()
+                scenarios = config.get("scenarios", {})
+
+                if not scenarios:
+                    logger.warning("⚠️  配置文件中没有场景")
+                    return False
+
+                # 2. 一次遍历建立 名称 -> 键 索引（跳过受保护的键）
+                # 同时索引完整名称和去掉"检测"后缀的名称（兼容性）
+                name_index: Dict[str, str] = {}
+                stripped_index: Dict[str, str] = {}
                 for key, value in scenarios.items():
-                    # 跳过受保护的键（使用模块级常量）
-                    if key in PROTECTED_SCENE_KEYS:
+                    if key in PROTECTED_SCENE_KEYS or not isinstance(value, dict):
                         continue
-
-                    if isinstance(value, dict):
-                        config_name = value.get("name", "")
-
-                        # 直接完整匹配，或者去掉两边的"检测"后缀进行匹配
-                        if config_name == scene_name:
-                            keys_to_delete.append(key)
-                            found = True
-                            break
-
-                        # 尝试去掉"检测"后缀匹配（兼容性）
-                        config_name_stripped = (
+                    config_name = value.get("name", "")
+                    name_index.setdefault(config_name, key)
+                    stripped_index.setdefault(
+                        (
                             config_name[:-2]
                             if config_name.endswith("检测")
                             else config_name
-                        )
-                        scene_name_stripped = (
-                            scene_name[:-2]
-                            if scene_name.endswith("检测")
-                            else scene_name
-                        )
-
-                        if config_name_stripped == scene_name_stripped:
-                            keys_to_delete.append(key)
-                            found = True
-                            break
-
-                if not found:
-                    print(f"⚠️  未找到场景: {scene_name}")
-
-            if not keys_to_delete:
-                print(f"⚠️  未找到任何要删除的场景")
-                return False
+                        ),
+                        key,
+                    )
 
-            # 3. 删除场景
-            deleted_names = []
-            for key in keys_to_delete:
-                if key in scenarios:
-                    scene_name = scenarios[key].get("name", key)
-                    del scenarios[key]
-                    deleted_names.append(scene_name)
+                # 找到对应的场景键
+                keys_to_delete = []
+                for scene_name in deletable_scenes:
+                    key = name_index.get(scene_name) or stripped_index.get(
+                        scene_name[:-2] if scene_name.endswith("检测") else scene_name
+                    )
+                    if key is None:
+                        logger.warning(f"⚠️  未找到场景: {scene_name}")
+                    else:
+                        keys_to_delete.append(key)
 
-            # 4. 保存配置
-            config["scenarios"] = scenarios
-            self.save_config(config)
+                if not keys_to_delete:
+                    logger.warning(f"⚠️  未找到任何要删除的场景")
+                    return False
 
-            # 5. 重新计算所有场景的阈值（因为场景数量变化了）
-            if deleted_names:
-                self.recalculate_all_thresholds()
-                print(f"🗑️  已删除: {', '.join(deleted_names)}")
+                # 3. 删除场景
+                deleted_names = []
+                for key in keys_to_delete:
+                    if key in scenarios:
+                        scene_name = scenarios[key].get("name", key)
+                        del scenarios[key]
+                        deleted_names.append(scene_name)
 
-            return True
+                # 4. 重新计算所有场景的阈值（因为场景数量变化了），与删除合并为一次保存
+                if deleted_names:
+                    self._recalculate_thresholds_inplace(scenarios)
+
+                # 5. 保存配置
+                config["scenarios"] = scenarios
+                self.save_config(config)
+
+                if deleted_names:
+                    logger.info(f"🗑️  已删除: {', '.join(deleted_names)}")
+
+                return True
 
         except Exception as e:
-            print(f"❌ 删除场景失败: {e}")
+            logger.error(f"❌ 删除场景失败: {e}")
             return False
 
-    def get_all_scene_names(self) -> List[str]:
+    def _collect_scene_names(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
         """
-        从配置文件获取所有场景的中文名称
+        一次加载、一次遍历，同时收集所有场景名称和启用的场景名称
+
+        配置未变化（缓存的配置对象未被替换）时直接返回上次的结果
+
+        Returns:
+            (所有场景名称, 启用的场景名称)，均为不可变元组
+        """
+        config = self._load_cached_config()
+        cached = self._scene_names_cache
+        if cached is not None and cached[0] is config:
+            return cached[1], cached[2]
+
+        scenarios = config.get("scenarios", {})
+
+        all_names = []
+        enabled_names = []
+        for key, value in scenarios.items():
+            is_dict = isinstance(value, dict)
+            if is_dict and "name" in value:
+                # 去掉"检测"后缀作为显示名称
+                name = value["name"].removesuffix("检测")
+            else:
+                name = key
+
+            all_names.append(name)
+            if is_dict and value.get("enabled", True):
+                enabled_names.append(name)
+
+        all_names, enabled_names = tuple(all_names), tuple(enabled_names)
+        self._scene_names_cache = (config, all_names, enabled_names)
+        return all_names, enabled_names
+
+    def get_scene_names(self, enabled_only: bool = False) -> List[str]:
+        """
+        从配置文件获取场景的中文名称
+
+        Args:
+            enabled_only: 是否只返回启用的场景
 
         Returns:
             场景名称列表
         """
         try:
-            config = self.load_current_config()
-            scenarios = config.get("scenarios", {})
-
-            names = []
-            for key, value in scenarios.items():
-                if isinstance(value, dict) and "name" in value:
-                    # 去掉"检测"后缀作为显示名称
-                    name = value["name"]
-                    if name.endswith("检测"):
-                        name = name[:-2]
-                    names.append(name)
-                else:
-                    names.append(key)
-
-            return names
+            all_names, enabled_names = self._collect_scene_names()
+            # 只复制调用方需要的那一份
+            return list(enabled_names if enabled_only else all_names)
         except Exception as e:
-            print(f"获取场景名称失败: {e}")
+            label = "启用场景" if enabled_only else "场景"
+            logger.error(f"获取{label}名称失败: {e}")
             return []
 
+    def get_all_scene_names(self) -> List[str]:
+        """
+        从配置文件获取所有场景的中文名称
+
+        Returns:
+            场景名称列表
+        """
+        return self.get_scene_names(enabled_only=False)
+
     def get_enabled_scene_names(self) -> List[str]:
         """
         获取所有启用的场景名称
@@ -1193,25 +2336,7 @@ class ConfigUpdater:
         Returns:
             启用的场景名称列表
         """
-        try:
-            config = self.load_current_config()
-            scenarios = config.get("scenarios", {})
-
-            names = []
-            for key, value in scenarios.items():
-                if isinstance(value, dict) and value.get("enabled", True):
-                    if "name" in value:
-                        name = value["name"]
-                        if name.endswith("检测"):
-                            name = name[:-2]
-                        names.append(name)
-                    else:
-                        names.append(key)
-
-            return names
-        except Exception as e:
-            print(f"获取启用场景名称失败: {e}")
-            return []
+        return self.get_scene_names(enabled_only=True)
 
 
 def test_config_updater():
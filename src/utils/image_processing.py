@@ -13,14 +13,23 @@
 - normalize_image(): 归一化图像
 - convert_to_rgb(): 转换为RGB格式
 - undistort_image(): 畸变矫正（需要相机标定参数）
+
+主要类：
+- Undistorter: 预计算映射表的畸变矫正器（逐帧矫正时使用）
 """
 
+from __future__ import annotations
+
+import functools
 import cv2
 import numpy as np
-from PIL import Image
-import torch
-from torchvision import transforms
-from typing import Union, Tuple, Optional
+from PIL import Image, ImageEnhance
+from typing import TYPE_CHECKING, Union, Tuple, Optional
+
+# torch / torchvision 导入开销很大（约数百毫秒），只在真正需要张量的函数中按需导入
+if TYPE_CHECKING:
+    import torch
+    from torchvision import transforms
 
 
 # CLIP标准归一化参数
@@ -28,6 +37,36 @@ CLIP_MEAN = [0.48145466, 0.4578275, 0.40821073]
 CLIP_STD = [0.26862954, 0.26130258, 0.27577711]
 
 
+@functools.lru_cache(maxsize=None)
+def _clip_norm_tensors() -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    CLIP归一化用的均值/标准差张量（首次调用时创建，之后复用）
+    
+    Returns:
+        (均值, 标准差)，形状均为(3, 1, 1)，可直接广播到(B, C, H, W)
+    """
+    import torch
+    mean = torch.tensor(CLIP_MEAN, dtype=torch.float32).view(3, 1, 1)
+    std = torch.tensor(CLIP_STD, dtype=torch.float32).view(3, 1, 1)
+    return mean, std
+
+
+@functools.lru_cache(maxsize=None)
+def _to_tensor_transform() -> transforms.ToTensor:
+    """ToTensor 无状态，复用一个实例"""
+    from torchvision import transforms
+    return transforms.ToTensor()
+
+
+def _cast(tensor: torch.Tensor, dtype: Optional[torch.dtype]) -> torch.Tensor:
+    """按需转换张量的数据类型（dtype为None时保持float32）"""
+    return tensor if dtype is None else tensor.to(dtype)
+
+# undistort_image 复用的矫正器，键为(相机内参, 畸变系数, 图像尺寸)
+_UNDISTORTER_CACHE = {}
+_UNDISTORTER_CACHE_SIZE = 4
+
+
 def convert_to_rgb(image: Union[np.ndarray, Image.Image]) -> Image.Image:
     """
     将图像转换为RGB格式的PIL Image
@@ -101,7 +140,8 @@ def center_crop(image: Image.Image, size: int) -> Image.Image:
 
 def normalize_image(image: torch.Tensor,
                     mean: list = CLIP_MEAN,
-                    std: list = CLIP_STD) -> torch.Tensor:
+                    std: list = CLIP_STD,
+                    dtype: Optional[torch.dtype] = None) -> torch.Tensor:
     """
     归一化图像张量
     
@@ -109,23 +149,30 @@ def normalize_image(image: torch.Tensor,
         image: 图像张量，形状为(C, H, W)，值域[0, 1]
         mean: 均值列表
         std: 标准差列表
+        dtype: 输出张量的数据类型，默认float32（模型使用半精度时可直接输出float16/bfloat16）
     
     Returns:
         归一化后的图像张量
     """
+    import torch
+    
     # 转换为张量
     if not isinstance(image, torch.Tensor):
         image = torch.tensor(image)
     
-    # 归一化
-    mean_tensor = torch.tensor(mean).view(-1, 1, 1)
-    std_tensor = torch.tensor(std).view(-1, 1, 1)
+    # 归一化（默认的CLIP参数直接使用缓存的张量，不再每次重新创建）
+    if mean is CLIP_MEAN and std is CLIP_STD:
+        mean_tensor, std_tensor = _clip_norm_tensors()
+    else:
+        mean_tensor = torch.tensor(mean).view(-1, 1, 1)
+        std_tensor = torch.tensor(std).view(-1, 1, 1)
     
-    return (image - mean_tensor) / std_tensor
+    return _cast((image - mean_tensor) / std_tensor, dtype)
 
 
 def preprocess_for_clip(image: Union[np.ndarray, Image.Image],
-                        size: int = 224) -> torch.Tensor:
+                        size: int = 224,
+                        dtype: Optional[torch.dtype] = None) -> torch.Tensor:
     """
     为CLIP模型预处理图像
     
@@ -139,10 +186,15 @@ def preprocess_for_clip(image: Union[np.ndarray, Image.Image],
     Args:
         image: 输入图像（numpy数组或PIL Image）
         size: 目标尺寸，默认224（ViT-B/32标准）
+        dtype: 输出张量的数据类型，默认float32（归一化按float32计算，最后再转换）
     
     Returns:
         预处理后的图像张量，形状为(C, H, W)
     """
+    # OpenCV帧（BGR uint8）走纯cv2快速路径，不经过PIL
+    if _is_bgr_frame(image):
+        return _preprocess_bgr_for_clip(image, size, dtype)
+    
     # 1. 转换为RGB
     image = convert_to_rgb(image)
     
@@ -152,31 +204,133 @@ def preprocess_for_clip(image: Union[np.ndarray, Image.Image],
     # 3. 中心裁剪
     image = center_crop(image, size)
     
-    # 4. 转换为张量
-    image_tensor = transforms.ToTensor()(image)
+    # 4. 转换为张量（新张量，可直接就地归一化）
+    image_tensor = _to_tensor_transform()(image)
     
     # 5. 归一化
-    image_tensor = normalize_image(image_tensor)
+    mean, std = _clip_norm_tensors()
+    return _cast(image_tensor.sub_(mean).div_(std), dtype)
+
+
+def _is_bgr_frame(image) -> bool:
+    """是否为OpenCV的三通道uint8帧（按BGR处理，走cv2快速路径）"""
+    return (isinstance(image, np.ndarray) and image.ndim == 3
+            and image.shape[2] == 3 and image.dtype == np.uint8)
+
+
+def _resize_crop_bgr(image: np.ndarray, size: int) -> np.ndarray:
+    """
+    OpenCV BGR图像的短边缩放和中心裁剪（一次缩放，裁剪后只对小图做颜色转换）
+    
+    Args:
+        image: BGR格式的uint8数组，形状为(H, W, 3)
+        size: 目标尺寸
+    
+    Returns:
+        RGB格式的uint8数组，形状为(size, size, 3)
+    """
+    # 短边缩放到size（与resize_image相同的尺寸计算）
+    h, w = image.shape[:2]
+    if w < h:
+        new_w, new_h = size, int(h * size / w)
+    else:
+        new_w, new_h = int(w * size / h), size
+    
+    # 与PIL路径（Image.BICUBIC）和CLIP的预处理一致，缩放统一用双三次插值
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_CUBIC)
+    
+    # 中心裁剪（numpy切片，不拷贝）
+    top = (new_h - size) // 2
+    left = (new_w - size) // 2
+    crop = resized[top:top + size, left:left + size]
+    
+    # 只对裁剪后的小图做BGR->RGB转换
+    return cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+
+
+def _preprocess_bgr_for_clip(image: np.ndarray, size: int,
+                             dtype: Optional[torch.dtype] = None) -> torch.Tensor:
+    """
+    OpenCV BGR图像的CLIP预处理
+    
+    Args:
+        image: BGR格式的uint8数组，形状为(H, W, 3)
+        size: 目标尺寸
+        dtype: 输出张量的数据类型，默认float32
+    
+    Returns:
+        预处理后的图像张量，形状为(C, H, W)
+    """
+    rgb = _resize_crop_bgr(image, size)
+    
+    import torch
     
-    return image_tensor
+    tensor = torch.from_numpy(rgb).permute(2, 0, 1).contiguous().float().div_(255.0)
+    mean, std = _clip_norm_tensors()
+    return _cast(tensor.sub_(mean).div_(std), dtype)
 
 
-def create_clip_transform(size: int = 224) -> transforms.Compose:
+def create_clip_transform(size: int = 224,
+                          dtype: Optional[torch.dtype] = None) -> transforms.Compose:
     """
     创建CLIP标准的图像预处理变换
     
     Args:
         size: 图像大小
+        dtype: 输出张量的数据类型，默认float32（非float32时在最后追加类型转换）
     
     Returns:
         torchvision transforms组合
     """
-    return transforms.Compose([
+    import torch
+    from torchvision import transforms
+    
+    steps = [
         transforms.Resize(size, interpolation=Image.BICUBIC),
         transforms.CenterCrop(size),
         transforms.ToTensor(),
         transforms.Normalize(mean=CLIP_MEAN, std=CLIP_STD)
-    ])
+    ]
+    if dtype is not None and dtype != torch.float32:
+        steps.append(transforms.ConvertImageDtype(dtype))
+    return transforms.Compose(steps)
+
+
+class Undistorter:
+    """
+    畸变矫正器：映射表只在创建时计算一次，之后每帧只做一次 cv2.remap
+    
+    cv2.undistort 每次调用都会重新计算整幅图的映射表，相机参数固定时这部分是重复计算。
+    """
+    
+    def __init__(self,
+                 camera_matrix: np.ndarray,
+                 distortion_coeffs: np.ndarray,
+                 image_size: Tuple[int, int]):
+        """
+        Args:
+            camera_matrix: 相机内参矩阵 (3x3)
+            distortion_coeffs: 畸变系数 (k1, k2, p1, p2, k3)
+            image_size: 图像尺寸 (width, height)
+        """
+        self.image_size = tuple(image_size)
+        # CV_16SC2 定点映射表内存减半，并且 remap 可走整数优化路径
+        self.map1, self.map2 = cv2.initUndistortRectifyMap(
+            camera_matrix, distortion_coeffs, None, camera_matrix,
+            self.image_size, cv2.CV_16SC2
+        )
+    
+    def __call__(self, image: np.ndarray) -> np.ndarray:
+        """
+        矫正一帧图像
+        
+        Args:
+            image: 输入图像（numpy数组，尺寸需与创建时一致）
+        
+        Returns:
+            矫正后的图像
+        """
+        return cv2.remap(image, self.map1, self.map2, cv2.INTER_LINEAR)
 
 
 def undistort_image(image: np.ndarray,
@@ -185,6 +339,8 @@ def undistort_image(image: np.ndarray,
     """
     使用相机标定参数矫正图像畸变
     
+    相同参数和尺寸的矫正器会被缓存复用；逐帧处理时也可直接创建 Undistorter。
+    
     Args:
         image: 输入图像（numpy数组）
         camera_matrix: 相机内参矩阵 (3x3)
@@ -193,7 +349,26 @@ def undistort_image(image: np.ndarray,
     Returns:
         矫正后的图像
     """
-    return cv2.undistort(image, camera_matrix, distortion_coeffs)
+    camera_matrix = np.asarray(camera_matrix, dtype=np.float64)
+    distortion_coeffs = np.asarray(distortion_coeffs, dtype=np.float64)
+    image_size = (image.shape[1], image.shape[0])
+    key = (camera_matrix.tobytes(), distortion_coeffs.tobytes(), image_size)
+    
+    undistorter = _UNDISTORTER_CACHE.get(key)
+    if undistorter is None:
+        if len(_UNDISTORTER_CACHE) >= _UNDISTORTER_CACHE_SIZE:
+            # 丢弃最早加入的矫正器
+            _UNDISTORTER_CACHE.pop(next(iter(_UNDISTORTER_CACHE)))
+        undistorter = Undistorter(camera_matrix, distortion_coeffs, image_size)
+        _UNDISTORTER_CACHE[key] = undistorter
+    
+    return undistorter(image)
+
+
+def _is_uint8_frame(image) -> bool:
+    """是否为可直接交给cv2处理的uint8灰度图或三通道图（通道顺序与PIL一致，按RGB处理）"""
+    return (isinstance(image, np.ndarray) and image.dtype == np.uint8
+            and (image.ndim == 2 or (image.ndim == 3 and image.shape[2] == 3)))
 
 
 def enhance_contrast(image: Union[np.ndarray, Image.Image],
@@ -208,13 +383,25 @@ def enhance_contrast(image: Union[np.ndarray, Image.Image],
     Returns:
         增强后的图像（与输入格式相同）
     """
+    if _is_uint8_frame(image):
+        # 与PIL相同的算法：以整幅图的平均灰度为中心线性拉伸
+        # 直接用cv2一次完成，省去numpy<->PIL的两次整图拷贝
+        channel_means = cv2.mean(image)
+        if image.ndim == 2:
+            gray_mean = channel_means[0]
+        else:
+            gray_mean = (channel_means[0] * 0.299 + channel_means[1] * 0.587
+                         + channel_means[2] * 0.114)
+        gray_mean = int(gray_mean + 0.5)
+        # addWeighted 饱和截断到[0, 255]（convertScaleAbs 会对负值取绝对值，不能用于 factor>1）
+        return cv2.addWeighted(image, factor, image, 0, gray_mean * (1.0 - factor))
+    
     is_numpy = isinstance(image, np.ndarray)
     
     if is_numpy:
         image = Image.fromarray(image)
     
     # 使用PIL增强对比度
-    from PIL import ImageEnhance
     enhancer = ImageEnhance.Contrast(image)
     enhanced = enhancer.enhance(factor)
     
@@ -236,13 +423,16 @@ def adjust_brightness(image: Union[np.ndarray, Image.Image],
     Returns:
         调整后的图像（与输入格式相同）
     """
+    if _is_uint8_frame(image):
+        # 与PIL相同的算法：像素值乘以factor后截断到[0, 255]
+        return cv2.addWeighted(image, factor, image, 0, 0)
+    
     is_numpy = isinstance(image, np.ndarray)
     
     if is_numpy:
         image = Image.fromarray(image)
     
     # 使用PIL调整亮度
-    from PIL import ImageEnhance
     enhancer = ImageEnhance.Brightness(image)
     adjusted = enhancer.enhance(factor)
     
@@ -253,17 +443,37 @@ def adjust_brightness(image: Union[np.ndarray, Image.Image],
 
 
 def batch_preprocess(images: list,
-                    size: int = 224) -> torch.Tensor:
+                    size: int = 224,
+                    dtype: Optional[torch.dtype] = None) -> torch.Tensor:
     """
     批量预处理图像
     
     Args:
         images: 图像列表
         size: 目标尺寸
+        dtype: 输出张量的数据类型，默认float32（半精度输出可减半CPU->GPU传输量）
     
     Returns:
         批量图像张量，形状为(B, C, H, W)
     """
-    processed = [preprocess_for_clip(img, size) for img in images]
-    return torch.stack(processed)
+    import torch
+    
+    # 预先分配整个批次的输出，每张图直接写入对应切片（省去逐张张量和 torch.stack 的拷贝）
+    batch = torch.empty((len(images), 3, size, size), dtype=torch.float32)
+    batch_array = batch.numpy()  # 与 batch 共享内存
+    
+    for i, img in enumerate(images):
+        # 与 preprocess_for_clip 相同的 RGB 转换、短边缩放和中心裁剪
+        # （OpenCV帧同样走cv2路径，单张与批量处理结果一致）
+        if _is_bgr_frame(img):
+            image = _resize_crop_bgr(img, size)
+        else:
+            image = center_crop(resize_image(convert_to_rgb(img), size), size)
+        # HWC uint8 -> CHW float32，写入时直接完成类型转换
+        batch_array[i] = np.asarray(image).transpose(2, 0, 1)
+    
+    # 整个批次一次性就地缩放到[0, 1]并归一化
+    mean, std = _clip_norm_tensors()
+    batch.div_(255.0).sub_(mean).div_(std)
+    return _cast(batch, dtype)
 
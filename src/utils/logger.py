@@ -5,12 +5,36 @@
 - 统一的日志配置
 - 文件和控制台双输出
 - 支持日志轮转
+- 文件写入在后台线程完成，不阻塞调用方
 """
 
+import atexit
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+# 文件日志的后台监听器（重复调用 setup_logger 时先停止旧的）
+_file_listener = None
+
+# 输出面向用户的进度与错误提示的 logger（如"AI 生成失败"、"使用默认配置"），
+# 无论全局级别如何都至少输出 INFO
+_USER_FACING_LOGGERS = ("src.utils",)
+
+
+def _stop_file_listener():
+    """停止文件日志监听器（写完队列中剩余的日志）"""
+    global _file_listener
+    if _file_listener is not None:
+        _file_listener.stop()
+        for handler in _file_listener.handlers:
+            handler.close()
+        _file_listener = None
+
+
+atexit.register(_stop_file_listener)
 
 
 def setup_logger(level: str = "INFO", 
@@ -33,6 +57,7 @@ def setup_logger(level: str = "INFO",
     
     # 清除已有handlers
     logger.handlers.clear()
+    _stop_file_listener()
     
     # 默认格式
     if log_format is None:
@@ -57,7 +82,19 @@ def setup_logger(level: str = "INFO",
             encoding='utf-8'
         )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        
+        # 通过队列交给后台线程写文件（磁盘较慢时不会卡住界面线程）
+        global _file_listener
+        log_queue = queue.SimpleQueue()
+        _file_listener = QueueListener(
+            log_queue, file_handler, respect_handler_level=True
+        )
+        _file_listener.start()
+        logger.addHandler(QueueHandler(log_queue))
+    
+    # 工具模块的用户提示经根logger的handlers输出
+    for name in _USER_FACING_LOGGERS:
+        logging.getLogger(name).setLevel(min(logger.level, logging.INFO))
     
     logger.info(f"✅ 日志系统初始化完成，级别: {level}")
     
@@ -7,13 +7,226 @@
 - 去风格化翻译，适合VLM输入
 """
 
+import asyncio
+import atexit
+import functools
+import gzip
+import importlib.util
 import logging
-from typing import List, Dict, Optional
+import os
+import queue
+import random
+import re
+import threading
+import time
+import unicodedata
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import json
 
 logger = logging.getLogger(__name__)
 
+# orjson 支持（可选依赖，缓存快照的读写快数倍；快照用紧凑格式，不缩进）
+# orjson.JSONDecodeError 是 ValueError 的子类，异常处理无需区分
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _dump_snapshot(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    _json_loads = json.loads
+
+    def _dump_snapshot(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _genai_module():
+    """
+    按需导入 google.genai（只在第一次真正需要调用API时导入，结果缓存）
+
+    Returns:
+        google.genai 模块，未安装或导入失败时返回 None
+    """
+    try:
+        # 先只查找模块是否存在，未安装时不走导入失败的异常路径
+        if importlib.util.find_spec("google.genai") is None:
+            return None
+    except (ImportError, ValueError):
+        return None
+    try:
+        from google import genai
+    except ImportError:
+        return None
+    return genai
+
+
+# 单条翻译的系统指令
+_SYSTEM_PROMPT = (
+    "You are a translator. Translate Chinese text to English for Vision-Language Models. "
+    "Provide only the translated text without any additional explanation or formatting."
+)
+
+# 批量翻译的提示词：每行一条，带编号，要求按相同编号逐行返回
+_BATCH_PROMPT = (
+    "Translate each numbered Chinese line to English for Vision-Language Model input. "
+    "Output exactly {count} lines, each prefixed with its number and a colon, "
+    "with no extra text.\n{lines}"
+)
+
+# 解析批量翻译结果中的一行："编号: 译文"（兼容全角冒号）
+# 只匹配行内空白，避免空译文的行把下一行的内容当作自己的译文
+_NUMBERED_LINE = re.compile(
+    r"^[ \t]*(\d+)[ \t]*[:：][ \t]*(.*?)[ \t\r]*$", re.MULTILINE
+)
+
+# 单条翻译的最大输出 token 数（批量请求按条数放大）
+_MAX_OUTPUT_TOKENS = 200
+
+# 每个批量请求最多包含的条数（更多时拆成多个请求并发发送）
+_BATCH_CHUNK_SIZE = 20
+
+# 并发翻译请求数上限
+_MAX_WORKERS = 8
+
+# 追加日志累计超过该条数时合并回 JSON 快照
+_CACHE_COMPACT_THRESHOLD = 256
+
+# 内存缓存的最大条数（超出时淘汰最久未使用的条目）
+_CACHE_MAX_ENTRIES = 10_000
+
+# 暂时性错误（限流/服务端错误/超时）的最大尝试次数和首次重试前的等待（秒，之后指数增长）
+_MAX_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.5
+
+# 可重试的 HTTP 状态码（google.genai.errors.APIError.code）
+_RETRYABLE_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# 合并并发 translate() 调用：最多等待该时间（秒）或凑满该条数后一起请求
+_COALESCE_WINDOW = 0.02
+_COALESCE_MAX_ITEMS = 16
+
+# 翻译失败的文本在该时间（秒）内不再重复请求，避免 API 故障时反复超时
+_FAILURE_TTL = 60.0
+
+
+# 中日韩统一表意文字（基本区、扩展 A 区、兼容区）
+_CJK_RE = re.compile(r"[\u4e00-\u9fff\u3400-\u4dbf\uf900-\ufaff]")
+
+
+def _needs_translation(text: str) -> bool:
+    """判断文本是否含有需要翻译的中文字符（纯 ASCII 先走 isascii 快速判断）"""
+    return not text.isascii() and _CJK_RE.search(text) is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _transient_error_types() -> Tuple[type, ...]:
+    """
+    暂时性错误的异常类型（只在第一次出错时解析，结果缓存）
+
+    google-genai 底层使用 httpx，其超时和连接错误不是内置 TimeoutError /
+    ConnectionError 的子类，需要单独匹配
+
+    Returns:
+        异常类型元组
+    """
+    types: List[type] = [TimeoutError, ConnectionError]
+    try:
+        import httpx
+
+        # TransportError 包含 TimeoutException 和各类连接/网络错误
+        types.append(httpx.TransportError)
+    except ImportError:
+        pass
+    try:
+        from google.genai import errors
+
+        # 5xx 服务端错误
+        types.append(errors.ServerError)
+    except ImportError:
+        pass
+    return tuple(types)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """判断 API 异常是否为暂时性错误（值得退避后重试）"""
+    if isinstance(error, _transient_error_types()):
+        return True
+    return getattr(error, "code", None) in _RETRYABLE_CODES
+
+
+def _cache_key(text: str) -> str:
+    """缓存键：NFKC 规范化并去除首尾空白（全角/半角、多余空白的写法共用一条缓存）"""
+    return unicodedata.normalize("NFKC", text).strip()
+
+
+# 启用缓存的翻译器实例（弱引用，不会让实例常驻），解释器退出时统一合并缓存日志
+_LIVE_TRANSLATORS: "weakref.WeakSet[ChineseTranslator]" = weakref.WeakSet()
+
+
+@atexit.register
+def _compact_live_caches():
+    """退出时为仍存活的翻译器写出完整缓存快照"""
+    for translator in list(_LIVE_TRANSLATORS):
+        translator._compact_cache()
+
+
+def _coalesce_loop(
+    translator_ref: "weakref.ref[ChineseTranslator]", inbox: queue.Queue
+):
+    """
+    合并线程：收集短时间内到达的单条翻译，作为一次批量请求发送
+
+    线程只持有翻译器的弱引用，只在处理一批请求期间临时取得强引用；
+    收到 None 或翻译器已被回收时退出。
+
+    Args:
+        translator_ref: 翻译器的弱引用
+        inbox: (原文, Future) 请求队列
+    """
+    while True:
+        item = inbox.get()
+        if item is None:
+            return
+        items = [item]
+        stop = False
+        deadline = time.monotonic() + _COALESCE_WINDOW
+        while len(items) < _COALESCE_MAX_ITEMS:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = inbox.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            items.append(item)
+
+        translator = translator_ref()
+        translated: Dict[str, str] = {}
+        if translator is not None:
+            try:
+                translated = translator._translate_misses(
+                    list(dict.fromkeys(text for text, _ in items))
+                )
+            except Exception as e:
+                logger.error(f"❌ 合并翻译失败: {e}，返回原文")
+            del translator
+        for text, future in items:
+            future.set_result(translated.get(text))
+        if stop:
+            return
+
 
 class ChineseTranslator:
     """中文提示词翻译器（惰性调用，首次翻译后缓存）"""
@@ -23,6 +236,7 @@ class ChineseTranslator:
         api_key: Optional[str] = None,
         model: str = "gemini-3-flash-preview",
         cache_enabled: bool = True,
+        coalesce: Optional[bool] = None,
     ):
         """
         初始化翻译器
@@ -31,16 +245,40 @@ class ChineseTranslator:
             api_key: Gemini API密钥
             model: 使用的模型
             cache_enabled: 是否启用缓存
+            coalesce: 是否合并多线程并发的 translate() 请求，默认读取环境变量
+                TRANSLATOR_COALESCE（未设置时关闭）
         """
         self.api_key = api_key
         self.model = model
         self.cache_enabled = cache_enabled
-        self.cache: Dict[str, str] = {}
-        self.cache_file = Path("data/.translation_cache.json")
+        # 键为 _cache_key 规范化后的文本，按最近使用顺序排列
+        self.cache: "OrderedDict[str, str]" = OrderedDict()
+        # 并发翻译时保护缓存的更新和保存
+        self._cache_lock = threading.Lock()
+        # 快照为 gzip 压缩的紧凑 JSON；旧版本的未压缩快照仅在加载时读取一次
+        self.cache_file = Path("data/.translation_cache.json.gz")
+        self._legacy_cache_file = Path("data/.translation_cache.json")
+        # 新译文先追加到日志（每行一个 JSON 对象），累计较多或退出时再合并到快照
+        self.cache_log = self._legacy_cache_file.with_suffix(".jsonl")
+        self._dirty_count = 0
+        # 最近翻译失败的文本：{缓存键: 失效时间（time.monotonic）}，不持久化
+        self._failed: Dict[str, float] = {}
+        # 缓存目录只在首次写入前创建一次，之后的写入不再重复 mkdir
+        self._cache_dir_ready = False
+        # 持久化缓存在第一次查询或写入时才加载，创建翻译器不读取文件
+        self._cache_loaded = False
 
-        # 加载持久化缓存
         if self.cache_enabled:
-            self._load_cache()
+            _LIVE_TRANSLATORS.add(self)
+
+        # 多个线程同时调用 translate() 时合并为批量请求（每次未命中会多等待一个合并窗口，
+        # 只对多线程并发调用有收益，默认关闭；顺序调用请用 translate_batch）
+        if coalesce is None:
+            coalesce = os.environ.get("TRANSLATOR_COALESCE") == "1"
+        self._coalesce = coalesce
+        self._inbox: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._coalesce_worker: Optional[threading.Thread] = None
+        self._coalesce_lock = threading.Lock()
 
         # 延迟初始化API客户端（仅在真正需要翻译时初始化）
         self.client = None
@@ -61,9 +299,14 @@ class ChineseTranslator:
             self._client_initialized = True
             return
 
-        try:
-            from google import genai
+        genai = _genai_module()
+        if genai is None:
+            logger.warning("⚠️  未安装 google-genai，翻译功能已禁用")
+            logger.warning("   安装命令: pip install google-genai")
+            self._client_initialized = True
+            return
 
+        try:
             self.client = genai.Client(api_key=self.api_key)
             logger.info(f"✅ 翻译API客户端初始化成功，模型: {self.model}")
         except Exception as e:
@@ -82,14 +325,19 @@ class ChineseTranslator:
         Returns:
             英文翻译结果，如果翻译失败则返回原文
         """
-        # 如果是纯英文，直接返回
-        if text.isascii():
+        # 不含中文字符（纯英文、数字、符号等）直接返回
+        if not _needs_translation(text):
             return text
 
         # 优先检查缓存（避免API调用）
-        if self.cache_enabled and text in self.cache:
+        cached = self._cache_get(text)
+        if cached is not None:
             logger.debug(f"✓ 从缓存获取翻译: {text[:20]}...")
-            return self.cache[text]
+            return cached
+
+        # 最近失败过的文本直接返回原文，不重复请求
+        if self._recently_failed(_cache_key(text)):
+            return text
 
         # 延迟初始化客户端（仅在首次需要翻译时）
         if not self._client_initialized:
@@ -100,66 +348,433 @@ class ChineseTranslator:
             logger.debug(f"翻译器未启用，返回原文: {text}")
             return text
 
+        # 与同时到达的其他请求合并发送（结果由合并线程写入缓存）
+        future = self._submit_coalesced(text)
+        if future is not None:
+            return future.result() or text
+
+        translated = self._translate_single_api(text)
+        if translated is None:
+            return text
+
+        # 保存到缓存（持久化）
+        self._update_cache({text: translated})
+        return translated
+
+    def _submit_coalesced(self, text: str) -> "Optional[Future[Optional[str]]]":
+        """
+        将单条翻译放入合并队列（首次调用时启动合并线程）
+
+        Args:
+            text: 中文文本
+
+        Returns:
+            完成时结果为译文的 Future（翻译失败时结果为 None），
+            未启用合并或翻译器已关闭时返回 None
+        """
+        with self._coalesce_lock:
+            if not self._coalesce:
+                return None
+            if self._coalesce_worker is None:
+                self._coalesce_worker = threading.Thread(
+                    target=_coalesce_loop,
+                    args=(weakref.ref(self), self._inbox),
+                    name="translate-coalesce",
+                    daemon=True,
+                )
+                self._coalesce_worker.start()
+                # 翻译器被回收时唤醒合并线程使其退出（finalize 不持有 self）
+                self._coalesce_finalizer = weakref.finalize(self, self._inbox.put, None)
+            future: "Future[Optional[str]]" = Future()
+            self._inbox.put((text, future))
+            return future
+
+    def close(self):
+        """停止合并线程并写出缓存快照（之后的 translate() 不再合并请求）"""
+        with self._coalesce_lock:
+            self._coalesce = False
+            if self._coalesce_worker is not None:
+                self._coalesce_finalizer()
+                self._coalesce_worker = None
+        if self.cache_enabled:
+            self._compact_cache()
+            _LIVE_TRANSLATORS.discard(self)
+
+    def _translate_single_api(self, text: str) -> Optional[str]:
+        """
+        调用API翻译单条文本（不读写缓存）
+
+        Args:
+            text: 中文文本
+
+        Returns:
+            英文翻译结果，失败返回 None
+        """
         try:
             # 调用API翻译
             logger.info(f"🌐 正在翻译: {text}")
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a translator. Translate Chinese text to English for Vision-Language Models. Provide only the translated text without any additional explanation or formatting.",
-                    },
-                    {"role": "user", "content": text},
-                ],
-                temperature=0.3,
-                max_tokens=200,
-            )
-
-            translated = response.choices[0].message.content.strip()
+            translated = self._generate(text, _MAX_OUTPUT_TOKENS).strip()
             logger.info(f"✓ 翻译完成: {text} -> {translated}")
-
-            # 保存到缓存（持久化）
-            if self.cache_enabled:
-                self.cache[text] = translated
-                self._save_cache()
-
             return translated
 
         except Exception as e:
             logger.error(f"❌ 翻译失败: {e}，返回原文")
+            self._mark_failed([text])
+            return None
+
+    def _recently_failed(self, key: str) -> bool:
+        """
+        检查文本是否在最近翻译失败过（过期记录顺便清除）
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            仍在失败冷却期内返回 True
+        """
+        expiry = self._failed.get(key)
+        if expiry is None:
+            return False
+        if expiry > time.monotonic():
+            return True
+        self._failed.pop(key, None)
+        return False
+
+    def _mark_failed(self, texts: List[str]) -> None:
+        """记录翻译失败的文本，冷却期内不再请求"""
+        expiry = time.monotonic() + _FAILURE_TTL
+        for text in texts:
+            self._failed[_cache_key(text)] = expiry
+
+    def _cache_get(self, text: str) -> Optional[str]:
+        """
+        按规范化后的键查找缓存，命中时标记为最近使用
+
+        Args:
+            text: 原文
+
+        Returns:
+            缓存的译文，未命中或未启用缓存时返回 None
+        """
+        if not self.cache_enabled:
+            return None
+        key = _cache_key(text)
+        with self._cache_lock:
+            self._ensure_cache_loaded()
+            translated = self.cache.get(key)
+            if translated is not None:
+                self.cache.move_to_end(key)
+            return translated
+
+    def _cache_put(self, entries: Dict[str, str]) -> Dict[str, str]:
+        """
+        以规范化后的键写入内存缓存并淘汰超出上限的旧条目（调用方需持有 _cache_lock）
+
+        Args:
+            entries: {原文: 译文}
+
+        Returns:
+            实际写入的 {缓存键: 译文}
+        """
+        # 空译文不写入缓存（包括旧版本缓存文件中残留的空值）
+        normalized = {
+            _cache_key(text): value for text, value in entries.items() if value
+        }
+        for key, value in normalized.items():
+            self.cache[key] = value
+            self.cache.move_to_end(key)
+        while len(self.cache) > _CACHE_MAX_ENTRIES:
+            self.cache.popitem(last=False)
+        return normalized
+
+    def _update_cache(self, entries: Dict[str, str]) -> None:
+        """
+        将新译文写入缓存，并追加到缓存日志（不重写整个缓存文件）
+
+        Args:
+            entries: {原文: 译文}
+        """
+        if not self.cache_enabled or not entries:
+            return
+        with self._cache_lock:
+            self._ensure_cache_loaded()
+            normalized = self._cache_put(entries)
+            if normalized:
+                self._append_cache(normalized)
+            if self._dirty_count > _CACHE_COMPACT_THRESHOLD:
+                self._save_cache()
+
+    def _generate(self, contents: str, max_output_tokens: int) -> str:
+        """
+        调用 Gemini 生成翻译（暂时性错误按指数退避重试）
+
+        Args:
+            contents: 发送给模型的文本
+            max_output_tokens: 最大输出 token 数
+
+        Returns:
+            模型返回的原始文本（批量结果由正则逐行解析，不需要先整体 strip）
+
+        Raises:
+            ValueError: 模型返回空内容（如被安全策略拦截），视为翻译失败
+            Exception: 不可重试的错误，或重试次数用尽后的最后一次错误
+        """
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                response = self.client.models.generate_content(
+                    model=self.model,
+                    contents=contents,
+                    config={
+                        "system_instruction": _SYSTEM_PROMPT,
+                        "temperature": 0.3,
+                        "max_output_tokens": max_output_tokens,
+                    },
+                )
+                text = response.text or ""
+            except Exception as e:
+                if attempt == _MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                    raise
+                # 加入随机抖动，避免并发请求同时重试
+                delay = _RETRY_BASE_DELAY * (2**attempt) + random.uniform(0, 0.2)
+                logger.warning(f"⚠️  翻译请求失败: {e}，{delay:.1f} 秒后重试")
+                time.sleep(delay)
+                continue
+            if not text.strip():
+                raise ValueError("模型返回空内容")
             return text
 
     def translate_batch(self, texts: List[str]) -> List[str]:
         """
-        批量翻译
+        批量翻译（未缓存的文本合并为一次 API 请求）
 
         Args:
             texts: 中文文本列表
 
         Returns:
-            英文翻译列表
+            英文翻译列表，与输入一一对应；单条解析失败时该条返回原文
+        """
+        # 一次扫描将输入分为：纯英文直通、缓存命中、未命中（按缓存键去重后统一请求）
+        results: List[Optional[str]] = [None] * len(texts)
+        misses: Dict[str, str] = {}  # 缓存键 -> 代表原文
+        pending: List[Tuple[int, str]] = []  # (位置, 缓存键)
+        with self._cache_lock:
+            if self.cache_enabled:
+                self._ensure_cache_loaded()
+            for i, text in enumerate(texts):
+                if not _needs_translation(text):
+                    results[i] = text
+                    continue
+                key = _cache_key(text)
+                cached = self.cache.get(key) if self.cache_enabled else None
+                if cached is not None:
+                    self.cache.move_to_end(key)
+                    results[i] = cached
+                elif self._recently_failed(key):
+                    results[i] = text
+                else:
+                    misses.setdefault(key, text)
+                    pending.append((i, key))
+
+        if misses:
+            translated = self._translate_misses(list(misses.values()))
+            for i, key in pending:
+                results[i] = translated.get(misses[key], texts[i])
+        return results
+
+    async def atranslate(self, text: str) -> str:
         """
-        return [self.translate(text) for text in texts]
+        异步翻译单个文本（在线程池中执行 translate，不阻塞事件循环）
+
+        Args:
+            text: 中文文本
+
+        Returns:
+            英文翻译结果，如果翻译失败则返回原文
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.translate, text)
+
+    async def atranslate_batch(self, texts: List[str]) -> List[str]:
+        """
+        异步批量翻译（在线程池中执行 translate_batch，保留合并请求）
+
+        Args:
+            texts: 中文文本列表
+
+        Returns:
+            英文翻译列表，与输入一一对应
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.translate_batch, texts)
+
+    def _translate_misses(self, texts: List[str]) -> Dict[str, str]:
+        """
+        翻译未命中缓存的文本（按批量请求拆分后并发发送）
+
+        Args:
+            texts: 去重后的中文文本列表
+
+        Returns:
+            {原文: 译文}，未翻译成功的文本不包含在内
+        """
+        if not self._client_initialized:
+            self._init_client()
+        if not self.client:
+            logger.debug(f"翻译器未启用，返回原文: {len(texts)} 条")
+            return {}
+
+        # 含换行的文本无法按行编号，逐条请求；其余按块合并为批量请求
+        single = [text for text in texts if "\n" in text]
+        batch = [text for text in texts if "\n" not in text]
+        chunks = [
+            batch[i : i + _BATCH_CHUNK_SIZE]
+            for i in range(0, len(batch), _BATCH_CHUNK_SIZE)
+        ]
+        # 只有一条的块不需要编号
+        for chunk in [c for c in chunks if len(c) == 1]:
+            chunks.remove(chunk)
+            single += chunk
+
+        jobs = [(self._translate_one, text) for text in single]
+        jobs += [(self._translate_chunk, chunk) for chunk in chunks]
+        if len(jobs) == 1:
+            func, arg = jobs[0]
+            results = [func(arg)]
+        else:
+            # 各请求互相独立且都在等待网络，并发发送
+            with ThreadPoolExecutor(
+                max_workers=min(_MAX_WORKERS, len(jobs)),
+                thread_name_prefix="translate",
+            ) as executor:
+                results = list(executor.map(lambda job: job[0](job[1]), jobs))
+
+        translated: Dict[str, str] = {}
+        for result in results:
+            translated.update(result)
+
+        # 所有新译文写入缓存后只保存一次
+        self._update_cache(translated)
+        return translated
+
+    def _translate_one(self, text: str) -> Dict[str, str]:
+        """单条翻译（并发任务），返回 {原文: 译文}，失败返回空字典"""
+        translated = self._translate_single_api(text)
+        return {} if translated is None else {text: translated}
+
+    def _translate_chunk(self, chunk: List[str]) -> Dict[str, str]:
+        """
+        一次请求翻译多条单行文本（并发任务）
+
+        Args:
+            chunk: 中文文本列表（不含换行）
+
+        Returns:
+            {原文: 译文}，未能解析的条目不包含在内
+        """
+        lines = "\n".join(f"{i}: {text}" for i, text in enumerate(chunk, 1))
+        prompt = _BATCH_PROMPT.format(count=len(chunk), lines=lines)
+        try:
+            logger.info(f"🌐 正在批量翻译: {len(chunk)} 条")
+            response_text = self._generate(prompt, _MAX_OUTPUT_TOKENS * len(chunk))
+        except Exception as e:
+            logger.error(f"❌ 批量翻译失败: {e}，返回原文")
+            self._mark_failed(chunk)
+            return {}
+
+        entries = {}
+        for number, value in _NUMBERED_LINE.findall(response_text):
+            index = int(number) - 1
+            if 0 <= index < len(chunk) and value:
+                entries[chunk[index]] = value
+        missing = len(chunk) - len(entries)
+        if missing:
+            logger.warning(f"⚠️  批量翻译有 {missing} 条未能解析，返回原文")
+        logger.info(f"✓ 批量翻译完成: {len(entries)}/{len(chunk)}")
+        return entries
+
+    def _ensure_cache_loaded(self):
+        """首次访问缓存时加载持久化缓存（调用方需持有 _cache_lock）"""
+        if not self._cache_loaded:
+            self._cache_loaded = True
+            self._load_cache()
 
     def _load_cache(self):
-        """加载翻译缓存"""
+        """加载翻译缓存（JSON 快照 + 追加日志）"""
+        snapshot = None
         if self.cache_file.exists():
+            snapshot = self.cache_file
+        elif self._legacy_cache_file.exists():
+            snapshot = self._legacy_cache_file
+        if snapshot is not None:
             try:
-                with open(self.cache_file, "r", encoding="utf-8") as f:
-                    self.cache = json.load(f)
+                data = snapshot.read_bytes()
+                if snapshot is self.cache_file:
+                    data = gzip.decompress(data)
+                # 旧版本的缓存键未规范化，加载时统一转换
+                self._cache_put(_json_loads(data))
                 logger.debug(f"加载翻译缓存: {len(self.cache)} 条")
             except Exception as e:
                 logger.warning(f"加载缓存失败: {e}")
-                self.cache = {}
+                self.cache = OrderedDict()
 
-    def _save_cache(self):
-        """保存翻译缓存"""
+        # 重放快照之后追加的译文（写到一半的最后一行直接跳过）
+        if self.cache_log.exists():
+            try:
+                with open(self.cache_log, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = _json_loads(line)
+                        except ValueError:
+                            continue
+                        if isinstance(entry, dict):
+                            self._cache_put(entry)
+                            self._dirty_count += len(entry)
+            except Exception as e:
+                logger.warning(f"加载缓存日志失败: {e}")
+
+    def _append_cache(self, entries: Dict[str, str]):
+        """
+        追加新译文到缓存日志（调用方需持有 _cache_lock）
+
+        Args:
+            entries: {缓存键: 译文}
+        """
         try:
+            self._ensure_cache_dir()
+            lines = "".join(
+                json.dumps({text: translated}, ensure_ascii=False) + "\n"
+                for text, translated in entries.items()
+            )
+            with open(self.cache_log, "a", encoding="utf-8") as f:
+                f.write(lines)
+            self._dirty_count += len(entries)
+        except Exception as e:
+            logger.warning(f"追加缓存日志失败: {e}")
+
+    def _ensure_cache_dir(self):
+        """确保缓存目录存在（只在第一次写入时创建）"""
+        if not self._cache_dir_ready:
             self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_file, "w", encoding="utf-8") as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+            self._cache_dir_ready = True
+
+    def _compact_cache(self):
+        """有未合并的追加日志时写出完整快照（退出时调用）"""
+        with self._cache_lock:
+            if self._dirty_count:
+                self._save_cache()
+
+    def _save_cache(self):
+        """保存完整的翻译缓存快照，并清空追加日志（调用方需持有 _cache_lock）"""
+        try:
+            self._ensure_cache_dir()
+            # 先写临时文件再替换，快照写入中断时旧快照和日志仍然完整
+            tmp = self.cache_file.with_name(f"{self.cache_file.name}.tmp")
+            tmp.write_bytes(gzip.compress(_dump_snapshot(self.cache), compresslevel=6))
+            os.replace(tmp, self.cache_file)
+            self._legacy_cache_file.unlink(missing_ok=True)
+            self.cache_log.unlink(missing_ok=True)
+            self._dirty_count = 0
             logger.debug(f"保存翻译缓存: {len(self.cache)} 条")
         except Exception as e:
             logger.warning(f"保存缓存失败: {e}")